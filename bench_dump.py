@@ -0,0 +1,180 @@
+# bench_dump.py
+# --- Imports Section ---
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from profiles import default_profiles
+from path_matcher import glob_to_regex, PathMatcher
+from text_minifier import minify_js
+from part_packer import pack_best_fit, partition_parts
+from file_worker import split_large_file
+# --- Synthetic Data Section ---
+def synthetic_paths(count, seed=1234):
+    rng = random.Random(seed)
+    top_dirs = ["src", "lib", "packages/app", "packages/ui", "node_modules/react", "node_modules/lodash", ".git/objects", "build", "dist", "docs", "tests", "public", "target/debug"]
+    names = ["index", "main", "utils", "App", "component", "helpers", "config", "server", "styles", "README"]
+    exts = [".js", ".ts", ".tsx", ".css", ".html", ".json", ".md", ".py", ".log", ".png", ".map", ""]
+    paths = []
+    for i in range(count):
+        depth = rng.randint(0, 4)
+        parts = [rng.choice(top_dirs)] + [f"mod{rng.randint(0, 50)}" for _ in range(depth)]
+        parts.append(f"{rng.choice(names)}{i % 97}{rng.choice(exts)}")
+        paths.append("/".join(parts))
+    return paths
+# --- Matcher Benchmark Section ---
+def legacy_should_include(relative_path, config):
+    # Pre-PathMatcher behaviour of core_dump.should_include_file (without per-file logging)
+    ext = Path(relative_path).suffix.lower()
+    has_matching_ext = ext in [e.lower() for e in config["Extensions"]]
+    has_include_match = any(re.match(glob_to_regex(pattern), relative_path, re.IGNORECASE) for pattern in config["IncludePatterns"])
+    if not has_matching_ext and not has_include_match:
+        return False
+    if any(re.match(glob_to_regex(pattern), relative_path, re.IGNORECASE) for pattern in config["Exclude"]):
+        return False
+    return True
+def bench_matcher(count):
+    paths = synthetic_paths(count)
+    gitignore_like = ["**/" + p for p in ["*.pyc", "*.o", "*.tmp", "coverage", ".env", "*.swp", ".DS_Store", "npm-debug.log*"]]
+    for profile_name in ["Web Dev", "Python Dev", "C/CPP Dev"]:
+        profile = default_profiles[profile_name]
+        config = {"Extensions": profile["Extensions"], "IncludePatterns": profile["IncludePatterns"], "Exclude": profile["Exclude"] + gitignore_like}
+        start = time.perf_counter()
+        legacy = [p for p in paths if legacy_should_include(p, config)]
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        matcher = PathMatcher.from_config(config)
+        compiled = [p for p in paths if matcher.includes(p)]
+        compiled_time = time.perf_counter() - start
+        if legacy != compiled:
+            print(f"{profile_name}: MISMATCH ({len(legacy)} legacy vs {len(compiled)} compiled)")
+            return 1
+        print(f"{profile_name}: {len(compiled)}/{count} included | legacy {count / legacy_time:,.0f} files/s | PathMatcher {count / compiled_time:,.0f} files/s | {legacy_time / compiled_time:.1f}x")
+    return 0
+# --- Minifier Benchmark Section ---
+JS_SNIPPETS = [
+    "/**\n * Module {i}: block comment with a // inside\n */\n",
+    "const url{i} = \"https://example.com/api/v{i}\"; // endpoint\n",
+    "function handler{i}(request, response) {{\n    const pattern = /^\\/api\\/v[0-9]+\\//i;\n    if (pattern.test(request.path) && request.method === 'GET') {{\n        return response.send(`item ${{request.id}}: ${{request.name || 'none'}}`);\n    }}\n    return null;\n}}\n",
+    "export const total{i} = items.reduce((sum, item) => sum + item.price * item.count, 0) / 100;\n",
+    "class Widget{i} extends Base {{\n    constructor(options) {{\n        super(options);\n        this.label = 'Widget \\'{i}\\'';\n    }}\n}}\n",
+]
+def synthetic_js(count, seed=1234):
+    rng = random.Random(seed)
+    return "".join(rng.choice(JS_SNIPPETS).format(i=i) for i in range(count))
+def legacy_minify_js(content):
+    # Regex chain used by core_dump.minify_content before text_minifier
+    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+    content = re.sub(r'//.*?(?=\n|$)', '', content)
+    content = re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE)
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
+    content = ' '.join(lines)
+    content = re.sub(r'\s*([{};,=+\-*/])\s*', r'\1', content)
+    return re.sub(r'\s+', ' ', content)
+def bench_minify(count, files=None):
+    sources = [(path, Path(path).read_text(encoding="utf-8")) for path in files] if files else [(f"synthetic ({count} snippets)", synthetic_js(count))]
+    for name, content in sources:
+        start = time.perf_counter()
+        legacy = legacy_minify_js(content)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        minified = minify_js(content)
+        lexer_time = time.perf_counter() - start
+        mb = len(content) / 1e6
+        print(f"{name}: {len(content):,} chars | legacy {mb / legacy_time:.1f} MB/s -> {len(legacy):,} | lexer {mb / lexer_time:.1f} MB/s -> {len(minified):,} | {legacy_time / lexer_time:.1f}x")
+    return 0
+# --- Splitter Benchmark Section ---
+def synthetic_text(size, seed=1234):
+    # Source-like text of the given size: lines of 0-120 characters
+    rng = random.Random(seed)
+    block = "".join("x" * rng.randint(0, 120) + "\n" for _ in range(20000))
+    return (block * (size // len(block) + 1))[:size]
+def bench_split(sizes_mb, max_section_size):
+    for size_mb in sizes_mb:
+        content = synthetic_text(int(size_mb * 1000000))
+        start = time.perf_counter()
+        sections = split_large_file(content, "big.txt", max_section_size, "md", "text")
+        elapsed = time.perf_counter() - start
+        print(f"{size_mb:g} MB: {len(sections):,} sections in {elapsed:.3f}s | {size_mb / elapsed:.0f} MB/s | {elapsed * 1000 / size_mb:.2f} ms per MB")
+    return 0
+# --- Packer Benchmark Section ---
+def synthetic_sections(count, max_section_size=15000, seed=1234):
+    # Sections as _process_dump packs them: log-normal file sizes, the ones over the single file limit split into
+    # full sections and a remainder
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        size = min(int(rng.lognormvariate(8, 1.2)) + 100, 200000)
+        index = 1
+        while size > 0 and len(items) < count:
+            length = min(size, max_section_size - 500)
+            items.append({"RelativePath": f"src/mod{i % 211}/file{i}.py (Part {index})", "Length": length, "EffectiveLength": length + 50})
+            size -= length
+            index += 1
+        if len(items) >= count:
+            break
+    return items
+def legacy_pack(items, max_part_size, base_length, first_part_extra=0):
+    # First-Fit Decreasing loop used by core_dump._process_dump before part_packer
+    parts = []
+    for item in sorted(items, key=lambda x: x["EffectiveLength"], reverse=True):
+        placed = False
+        for i in range(len(parts)):
+            cl, clist = parts[i]
+            if cl + item["EffectiveLength"] <= max_part_size - (first_part_extra if i == 0 else 0):
+                parts[i] = (cl + item["EffectiveLength"], clist + [item])
+                placed = True
+                break
+        if not placed:
+            parts.append((base_length + (first_part_extra if not parts else 0) + item["EffectiveLength"], [item]))
+    return parts
+def legacy_pack_fixed(items, part_count):
+    # Least-full-part loop used for --max-output-parts before partition_parts
+    parts = [(0, []) for _ in range(part_count)]
+    for item in sorted(items, key=lambda x: x["EffectiveLength"], reverse=True):
+        min_bin = min(range(part_count), key=lambda i: parts[i][0])
+        cl, clist = parts[min_bin]
+        parts[min_bin] = (cl + item["EffectiveLength"], clist + [item])
+    return parts
+def bench_pack(count, max_part_size, part_count=20, legacy=True):
+    items = synthetic_sections(count)
+    base_length = 300
+    start = time.perf_counter()
+    parts = pack_best_fit(items, max_part_size, base_length, 2000)
+    best_fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    fixed, lower_bound = partition_parts(items, part_count)
+    fixed_time = time.perf_counter() - start
+    print(f"{count:,} sections: best fit {len(parts):,} parts in {best_fit_time:.3f}s | {part_count} balanced parts in {fixed_time:.3f}s (largest {max(size for size, _ in fixed):,}, lower bound {lower_bound:,})")
+    if legacy:
+        start = time.perf_counter()
+        legacy_parts = legacy_pack(items, max_part_size, base_length, 2000)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy_fixed = legacy_pack_fixed(items, part_count)
+        legacy_fixed_time = time.perf_counter() - start
+        print(f"legacy: first fit {len(legacy_parts):,} parts in {legacy_time:.3f}s | {part_count} fixed parts in {legacy_fixed_time:.3f}s (largest {max(size for size, _ in legacy_fixed):,})")
+    return 0
+# --- Main Section ---
+def main():
+    parser = argparse.ArgumentParser(description="Project Dump Tool micro-benchmarks")
+    parser.add_argument("benchmark", choices=["matcher", "minify", "split", "pack"])
+    parser.add_argument("--count", type=int, default=50000, help="Number of synthetic paths, JS snippets or sections")
+    parser.add_argument("--sizes", default="1,10,100", help="Comma-separated input sizes in MB (split benchmark)")
+    parser.add_argument("--max-part-size", type=int, default=19000, help="Section size limit (split benchmark) or part size limit (pack benchmark)")
+    parser.add_argument("--no-legacy", action="store_true", help="Skip the quadratic pre-part_packer loops (pack benchmark)")
+    parser.add_argument("files", nargs="*", help="Files to minify instead of synthetic JS (minify benchmark)")
+    args = parser.parse_args()
+    if args.benchmark == "matcher":
+        return bench_matcher(args.count)
+    if args.benchmark == "minify":
+        return bench_minify(args.count, args.files)
+    if args.benchmark == "split":
+        return bench_split([float(size) for size in args.sizes.split(",")], args.max_part_size)
+    if args.benchmark == "pack":
+        return bench_pack(args.count, args.max_part_size, legacy=not args.no_legacy)
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
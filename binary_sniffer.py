@@ -0,0 +1,37 @@
+# binary_sniffer.py
+# --- Imports Section ---
+import codecs
+# --- Constants Section ---
+SNIFF_SIZE = 8192 # Bytes inspected at the start of each file
+SNIFF_CACHE_LIMIT = 100000
+MAGIC_NUMBERS = (
+    # Only signatures that cannot plausibly start a text file; formats with NUL bytes in their header are caught anyway
+    b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a", b"RIFF", b"OggS", b"fLaC", b"\x1aE\xdf\xa3",
+    b"%PDF-", b"PK\x03\x04", b"PK\x05\x06", b"\x1f\x8b", b"\xfd7zXZ", b"7z\xbc\xaf\x27\x1c", b"Rar!\x1a\x07", b"\x28\xb5\x2f\xfd",
+    b"\x7fELF", b"\xca\xfe\xba\xbe", b"\xcf\xfa\xed\xfe", b"\xce\xfa\xed\xfe", b"wOFF", b"wOF2", b"SQLite format 3",
+)
+# --- Sniffing Section ---
+sniff_cache = {} # (path, size, mtime_ns) -> is_binary
+def looks_binary(head):
+    # Classifies a file from its first block: known magic numbers, NUL bytes, or bytes that are not valid UTF-8
+    if not head:
+        return False
+    if head.startswith(MAGIC_NUMBERS) or head[4:8] == b"ftyp": # ftyp: MP4/MOV/HEIC
+        return True
+    if b"\x00" in head:
+        return True
+    try:
+        # final=False tolerates a multi-byte character cut off at the end of the block
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+def sniff_is_binary(path, stat_result, head):
+    key = (path, stat_result.st_size, stat_result.st_mtime_ns)
+    result = sniff_cache.get(key)
+    if result is None:
+        if len(sniff_cache) >= SNIFF_CACHE_LIMIT:
+            sniff_cache.clear()
+        result = sniff_cache[key] = looks_binary(bytes(head[:SNIFF_SIZE]))
+    return result
+# TODO (Enhancement): Recognise UTF-16 text by its BOM and transcode it instead of treating it as binary.
@@ -6,7 +6,7 @@ import re
 import hashlib
 import tempfile
 import subprocess
-from collections import defaultdict
+from collections import defaultdict, deque
 import zipfile
 from pathlib import Path
 from datetime import datetime
@@ -14,15 +14,41 @@ import sys
 import argparse
 import shutil
 import base64
+import copy
+import atexit
+import contextlib
+import mmap
+import functools
+import struct
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from profiles import default_profiles # Imported from separate file for better modularity
+from path_matcher import glob_to_regex, PathMatcher
+from project_walker import walk_project, DEFAULT_WALK_WORKERS
+from gitignore import GitignoreEngine
+from git_index import tracked_files
+from file_cache import open_file_cache, SessionFileCache
+from file_watcher import watch_project
+from binary_sniffer import SNIFF_SIZE, sniff_is_binary
+from part_writer import base64_length, write_part
+from part_packer import pack_best_fit, pack_by_locality, partition_parts
+from minifier_service import MinifierService, DEFAULT_TIMEOUT as DEFAULT_MINIFIER_TIMEOUT
+from minifier_registry import create_registry
+from minify_cache import MinifyCache, CACHE_DIR, DEFAULT_MAX_MB as DEFAULT_MINIFY_CACHE_MB
+from token_estimator import CharacterCounter, create_estimator
+from file_worker import log_write, log_message, create_section_header, split_large_file, build_text_items, init_worker, start_worker, process_text
 import logging
 try:
     import py7zr # type: ignore
 except ImportError:
     py7zr = None
+from dump_logging import setup_logging, set_log_level, debug_enabled, ProgressReporter
 # --- Constants and Logging Setup Section ---
-log_path = Path(__file__).parent / "dump-project.log"
-logging.basicConfig(filename=str(log_path), level=logging.INFO, format='%(asctime)s - %(message)s', filemode='w')
+# One log file per run under logs/, written by a background listener. Worker processes started with the spawn method
+# re-import the main script and with it this module; they log through file_worker instead.
+log_path = setup_logging() if multiprocessing.current_process().name == "MainProcess" else None
+MMAP_THRESHOLD = 4 * 1024 * 1024 # Files at least this large are memory-mapped instead of read
 logging.info(f"Starting script at {datetime.now()}")
 # --- Config Loading Section ---
 config_path = Path(__file__).parent / "dump-config.json"
@@ -48,6 +74,11 @@ if config_path.exists():
         logging.error(f"Failed to load dump-config.json: {e}")
 else:
     logging.info("No dump-config.json found, using default config")
+# External minifiers are located once; their Node workers are shared by all dumps in this process
+minify_cache = MinifyCache(CACHE_DIR, custom_config.get("MinifyCacheMaxMB", DEFAULT_MINIFY_CACHE_MB)) if custom_config.get("MinifyCache", True) else None
+minifier_service = MinifierService(timeout=custom_config.get("MinifierTimeout", DEFAULT_MINIFIER_TIMEOUT), cache=minify_cache)
+atexit.register(minifier_service.close)
+minifier_registry = create_registry(minifier_service, custom_config)
 # --- Default Configurations Section ---
 # Note: These paths are loaded from config only if no CLI args; CLI args override in memory for the session. Do not save LastStartDir or LastOutputDir to config when CLI args provided, to avoid overriding CLI.
 default_start_dir = custom_config.get("LastStartDir", os.getcwd())
@@ -73,6 +104,10 @@ default_timestamp = custom_config.get("LastTimestamp", False)
 default_profile = custom_config.get("LastProfile", "Web Dev") # Default to Web Dev on first start
 default_max_output_parts = int(custom_config.get("LastMaxOutputParts", 0)) # 0 means no limit
 default_use_default_backup_path = custom_config.get("UseDefaultBackupPath", True)
+default_jobs = int(custom_config.get("Jobs", min(8, os.cpu_count() or 1))) # Worker threads for the per-file stage
+default_size_unit = custom_config.get("SizeUnit", "chars") # Unit of the part size and file limits: "chars" or "tokens"
+default_packing = custom_config.get("Packing", "size") # "size" fills parts best fit, "locality" keeps directories together
+default_packing_slack = float(custom_config.get("PackingSlack", 0.1)) # Extra parts locality packing may use, as a fraction of best fit's
 # --- Language Mapping Section ---
 ext_to_lang = {
     ".py": "python",
@@ -99,11 +134,6 @@ ext_to_lang = {
     # Add more mappings as needed for supported extensions
 }
 # --- Helper Functions Section ---
-def log_write(message):
-    logging.info(message)
-def log_message(message):
-    print(message)
-    log_write(message)
 def parse_list(s):
     if not s:
         return []
@@ -113,33 +143,6 @@ def parse_extensions(s):
         return []
     exts = parse_list(s)
     return [f".{e}" if not e.startswith('.') else e for e in exts]
-def glob_to_regex(pattern):
-    try:
-        temp_any = "TEMP_RECURSIVE_ANY"
-        regex = re.sub(r'\\', '/', pattern)
-        regex = re.sub(r'([.+^${}()|[\]])', r'\\\1', regex)
-        regex = regex.replace('**', temp_any)
-        regex = re.sub(r'\*', '[^/]*', regex)
-        regex = regex.replace(temp_any, '.*')
-        return f"^{regex}$"
-    except re.error as e:
-        raise ValueError(f"Invalid glob pattern '{pattern}': {e}")
-def parse_gitignore(gitignore_path):
-    patterns = []
-    try:
-        with open(gitignore_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                stripped = line.strip()
-                if stripped and not stripped.startswith('#') and stripped != '!':
-                    if stripped.startswith('/'):
-                        patterns.append(stripped[1:])
-                    elif stripped.endswith('/'):
-                        patterns.append(stripped[:-1] + '/**')
-                    else:
-                        patterns.append('**/' + stripped)
-    except Exception as e:
-        log_message(f"Error parsing .gitignore: {e}")
-    return patterns
 def build_tree_from_files(all_files, root_dir):
     tree = defaultdict(dict)
     for file_path in all_files:
@@ -167,70 +170,24 @@ def build_tree_from_files(all_files, root_dir):
         return lines
     lines = render_tree(tree)
     return "\n".join(lines) if lines else "No files included."
-def should_include_file(file_path, config, root_dir):
-    ext = Path(file_path).suffix.lower()
+def should_include_file(file_path, config, root_dir, matcher=None):
     relative_path = str(Path(file_path).relative_to(root_dir)).replace('\\', '/')
-    has_matching_ext = ext in [e.lower() for e in config["Extensions"]]
-    has_include_match = any(re.match(glob_to_regex(pattern), relative_path, re.IGNORECASE) for pattern in config["IncludePatterns"])
-    if not has_matching_ext and not has_include_match:
-        log_write(f"Excluded {relative_path} - No ext match and no include pattern")
-        return False
-    if any(re.match(glob_to_regex(pattern), relative_path, re.IGNORECASE) for pattern in config["Exclude"]):
-        log_write(f"Excluded {relative_path} - Matches exclude pattern")
+    return should_include_relative(relative_path, matcher or PathMatcher.from_config(config))
+def should_include_relative(relative_path, matcher):
+    reason = matcher.rejection_reason(relative_path)
+    if reason:
+        log_write(f"Excluded {relative_path} - {reason}")
         return False
     log_write(f"Included {relative_path}")
     return True
-def remove_comments(content, comment_regex):
-    return re.sub(comment_regex, '', content, flags=re.DOTALL)
-def collapse_whitespace(content):
-    content = re.sub(r'\s+', ' ', content)
-    return content
+@functools.lru_cache(maxsize=None)
+def size_estimator(size_unit):
+    # One estimator per unit for the whole process, so its memo carries over between dumps (watch mode, the GUI)
+    return create_estimator(custom_config, size_unit)
 def minify_content(ext, content, minify=False):
     if not minify:
         return content
-    ext = ext.lower()
-    if ext in [".js", ".ts", ".jsx", ".tsx"]:
-        if shutil.which("terser"):
-            try:
-                result = subprocess.run(["terser", "--compress", "--mangle"], input=content.encode(), capture_output=True, check=True)
-                return result.stdout.decode()
-            except Exception as e:
-                log_write(f"External minifier failed for {ext}: {e}, falling back to simple minify")
-        # Simple minify for JS/TS
-        content = remove_comments(content, r'/\*.*?\*/')
-        content = re.sub(r'//.*?(?=\n|$)', '', content)
-        content = re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE)
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        content = ' '.join(lines)
-        content = re.sub(r'\s*([{};,=+\-*/])\s*', r'\1', content)
-        return collapse_whitespace(content)
-    elif ext == ".css":
-        if shutil.which("cleancss"):
-            try:
-                result = subprocess.run(["cleancss", "-O2"], input=content.encode(), capture_output=True, check=True)
-                return result.stdout.decode()
-            except Exception as e:
-                log_write(f"External minifier failed for {ext}: {e}, falling back to simple minify")
-        # Simple minify for CSS
-        content = remove_comments(content, r'/\*.*?\*/')
-        return collapse_whitespace(content)
-    elif ext in [".html", ".htm"]:
-        if shutil.which("html-minifier"):
-            try:
-                result = subprocess.run(["html-minifier", "--collapse-whitespace", "--remove-comments"], input=content.encode(), capture_output=True, check=True)
-                return result.stdout.decode()
-            except Exception as e:
-                log_write(f"External minifier failed for {ext}: {e}, falling back to simple minify")
-        # Simple minify for HTML
-        content = remove_comments(content, r'<!--.*?-->')
-        content = re.sub(r'>\s+<', '><', content)
-        return content.strip()
-    return content
-def create_section_header(relative_path, is_first_part, split_part_num, format_out):
-    if is_first_part:
-        return f"## {relative_path}\n\n"
-    else:
-        return f"## Continuation of {relative_path} (Part {split_part_num})\n\n"
+    return minifier_registry.minify(ext, content)[0]
 def add_section(sections, relative_path, current_section, split_part_num, is_first_part, is_continuation):
     section_header = create_section_header(relative_path, is_first_part, split_part_num)
     full_section = section_header + current_section + "\n"
@@ -244,147 +201,6 @@ def add_section(sections, relative_path, current_section, split_part_num, is_fir
         "HasContinuation": is_continuation
     })
     log_write(f"Added section {split_part_num} for {relative_path} (size: {len(full_section)})")
-def split_large_file(content, relative_path, max_section_size, format_out, lang, include_hashes=False, file_hash=None, split_part_num=1, is_minify_mode=False):
-    sections = []
-    lines = content.splitlines(keepends=True) if content else []
-    current_section = ""
-    current_size = 0
-    effective_max = max_section_size - 500 # Conservative allowance for header and overhead
-    chunk_size = effective_max - 200
-    is_first_part = True
-    log_write(f"Splitting file {relative_path} into sections (max size: {max_section_size}, minifyMode: {is_minify_mode})")
-    if not content or not lines:
-        log_write(f"Warning: Empty content for {relative_path}, creating single empty section")
-        hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash else ""
-        h = create_section_header(relative_path + hash_str, True, 1, format_out)
-        lang_str = lang if lang else ""
-        section_header = h + f"``` {lang_str}\n" if lang_str else h + f"```\n"
-        code_end = "\n```\n\n"
-        full_section = section_header + "" + code_end
-        sections.append({
-            "RelativePath": relative_path,
-            "FileSection": full_section,
-            "Length": len(full_section),
-            "OriginalPath": relative_path,
-            "SectionIndex": split_part_num,
-            "HasContinuation": False
-        })
-        return sections
-    for line_index, line in enumerate(lines):
-        line_size = len(line)
-        assert line_index >= 0 and line_index < len(lines), "Off-by-one in line_index"
-        if line_size > effective_max:
-            log_write(f"Warning: Line too long in {relative_path} at line {line_index} (size: {line_size} > {effective_max}), force chunking")
-            pos = 0
-            while pos < len(line):
-                end_pos = min(pos + chunk_size, len(line))
-                assert pos < end_pos, "Off-by-one in chunk positions"
-                chunk = line[pos:end_pos]
-                chunk_size_actual = len(chunk)
-                more_in_line = end_pos < len(line)
-                more_lines = line_index < len(lines) - 1
-                has_more = more_in_line or more_lines
-                if current_size + chunk_size_actual > effective_max and current_section:
-                    if has_more:
-                        current_section += "# [CONTINUATION_PLACEHOLDER]\n"
-                    hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash and is_first_part else ""
-                    h = create_section_header(relative_path + hash_str if is_first_part else relative_path, is_first_part, split_part_num, format_out)
-                    lang_str = lang if lang else ""
-                    section_header = h + f"``` {lang_str}\n" if lang_str else h + f"```\n"
-                    code_end = "\n```\n\n"
-                    full_section = section_header + current_section + code_end
-                    sections.append({
-                        "RelativePath": relative_path if is_first_part else f"Continuation of {relative_path} (Part {split_part_num})",
-                        "FileSection": full_section,
-                        "Length": len(full_section),
-                        "OriginalPath": relative_path,
-                        "SectionIndex": split_part_num,
-                        "HasContinuation": has_more
-                    })
-                    split_part_num += 1
-                    is_first_part = False
-                    current_section = chunk
-                    current_size = chunk_size_actual
-                else:
-                    current_section += chunk
-                    current_size += chunk_size_actual
-                pos = end_pos
-            continue
-        elif not is_minify_mode and line_size > chunk_size:
-            log_write(f"Warning: Long line in non-minified {relative_path} at line {line_index} (length: {len(line)}), deferring whole line to next section")
-            if current_size + line_size > effective_max and current_section:
-                more_lines = line_index < len(lines) - 1
-                has_continuation = more_lines
-                if has_continuation:
-                    current_section += "# [CONTINUATION_PLACEHOLDER]\n"
-                hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash and is_first_part else ""
-                h = create_section_header(relative_path + hash_str if is_first_part else relative_path, is_first_part, split_part_num, format_out)
-                lang_str = lang if lang else ""
-                section_header = h + f"``` {lang_str}\n" if lang_str else h + f"```\n"
-                code_end = "\n```\n\n"
-                full_section = section_header + current_section + code_end
-                sections.append({
-                    "RelativePath": relative_path if is_first_part else f"Continuation of {relative_path} (Part {split_part_num})",
-                    "FileSection": full_section,
-                    "Length": len(full_section),
-                    "OriginalPath": relative_path,
-                    "SectionIndex": split_part_num,
-                    "HasContinuation": has_continuation
-                })
-                split_part_num += 1
-                is_first_part = False
-                current_section = line
-                current_size = line_size
-            else:
-                current_section += line
-                current_size += line_size
-            continue
-        else:
-            if current_size + line_size > effective_max and current_section:
-                more_lines = line_index < len(lines) - 1
-                has_continuation = more_lines
-                if has_continuation:
-                    current_section += "# [CONTINUATION_PLACEHOLDER]\n"
-                hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash and is_first_part else ""
-                h = create_section_header(relative_path + hash_str if is_first_part else relative_path, is_first_part, split_part_num, format_out)
-                lang_str = lang if lang else ""
-                section_header = h + f"``` {lang_str}\n" if lang_str else h + f"```\n"
-                code_end = "\n```\n\n"
-                full_section = section_header + current_section + code_end
-                sections.append({
-                    "RelativePath": relative_path if is_first_part else f"Continuation of {relative_path} (Part {split_part_num})",
-                    "FileSection": full_section,
-                    "Length": len(full_section),
-                    "OriginalPath": relative_path,
-                    "SectionIndex": split_part_num,
-                    "HasContinuation": has_continuation
-                })
-                split_part_num += 1
-                is_first_part = False
-                current_section = line
-                current_size = line_size
-            else:
-                current_section += line
-                current_size += line_size
-    if current_section:
-        hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash and is_first_part else ""
-        h = create_section_header(relative_path + hash_str if is_first_part else relative_path, is_first_part, split_part_num, format_out)
-        lang_str = lang if lang else ""
-        section_header = h + f"``` {lang_str}\n" if lang_str else h + f"```\n"
-        code_end = "\n```\n\n"
-        full_section = section_header + current_section + code_end
-        sections.append({
-            "RelativePath": relative_path if is_first_part else f"Continuation of {relative_path} (Part {split_part_num})",
-            "FileSection": full_section,
-            "Length": len(full_section),
-            "OriginalPath": relative_path,
-            "SectionIndex": split_part_num,
-            "HasContinuation": False
-        })
-    else:
-        log_write(f"Warning: No final section created for {relative_path}")
-    log_write(f"Completed splitting {relative_path} into {len(sections)} sections")
-    return sections
 def test_filter(start_dir, output_dir, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, input_type):
     try:
         if input_type == "GitHub":
@@ -405,17 +221,15 @@ def test_filter(start_dir, output_dir, extensions, include_patterns, exclude, ex
             if pat not in test_config["Exclude"]:
                 test_config["Exclude"].append(pat)
         root_for_test = os.path.dirname(start_dir) if os.path.isfile(start_dir) else start_dir
-        test_files = []
-        for root, dirs, files in os.walk(root_for_test):
-            for file in files:
-                test_files.append(os.path.join(root, file))
-        filtered_files = [f for f in test_files if should_include_file(f, test_config, root_for_test)]
+        filter_stats = {}
+        filtered_files = collect_files(root_for_test, test_config, stats=filter_stats)
         included_count = len(filtered_files)
+        skipped_note = f"Skipped {filter_stats['PrunedDirs']} excluded dir(s) and {filter_stats['SkippedFiles']} file(s)."
         if included_count == 0:
-            message = "Directory mode: 0 file(s) would be included after filtering."
+            message = f"Directory mode: 0 file(s) would be included after filtering.\n{skipped_note}"
         else:
             first_few = ', '.join(os.path.basename(f) for f in filtered_files[:5]) # Use basename for cleaner output
-            message = f"Directory mode: {included_count} file(s) would be included.\nFirst 5: {first_few}"
+            message = f"Directory mode: {included_count} file(s) would be included.\nFirst 5: {first_few}\n{skipped_note}"
         return message, "green"
     except Exception as e:
         return f"Test error: {e}", "red"
@@ -438,16 +252,49 @@ def apply_dynamic_patterns(include_patterns, exclude, dynamic_patterns, is_exclu
     else:
         exclude += dynamic_patterns
     return final_include, exclude
-def load_all_project_configs(project_dir):
+# --- Project Config Index Section ---
+# Discovered .dump-project.json files are cached per project and revalidated by stat'ing the directories seen in
+# the walk (any added/removed file changes a directory's mtime) plus each config file, so repeated lookups on an
+# unchanged tree never list a directory again.
+project_config_index = {}
+def _stat_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+def _project_index_is_fresh(index_entry):
+    paths = list(index_entry["Mtimes"])
+    with ThreadPoolExecutor(max_workers=DEFAULT_WALK_WORKERS) as pool:
+        current = list(pool.map(_stat_mtime, paths, chunksize=64))
+    return all(index_entry["Mtimes"][path] == mtime for path, mtime in zip(paths, current))
+def read_project_configs(config_paths):
     configs = []
-    for root, _, files in os.walk(project_dir):
-        if '.dump-project.json' in files:
-            path = os.path.join(root, '.dump-project.json')
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    configs.append(json.load(f))
-            except Exception as e:
-                logging.error(f"Failed to load config from {path}: {e}")
+    for path in config_paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                configs.append(json.load(f))
+        except Exception as e:
+            logging.error(f"Failed to load config from {path}: {e}")
+    return configs
+def cached_project_configs(project_dir):
+    index_entry = project_config_index.get(os.path.abspath(project_dir))
+    if index_entry is None or not _project_index_is_fresh(index_entry):
+        return None
+    return merge_project_configs(index_entry["Configs"])
+def load_all_project_configs(project_dir):
+    merged = cached_project_configs(project_dir)
+    if merged is not None:
+        return merged
+    dir_mtimes = {}
+    config_paths = [entry.path for _, entry in walk_project(project_dir, follow_symlinks=follows_symlinks(), dir_mtimes=dir_mtimes, file_filter=_is_project_config)]
+    mtimes = dict(dir_mtimes)
+    for path in config_paths:
+        mtimes[path] = _stat_mtime(path)
+    configs = read_project_configs(config_paths)
+    project_config_index[os.path.abspath(project_dir)] = {"Mtimes": mtimes, "Configs": configs}
+    return merge_project_configs(configs)
+def merge_project_configs(configs):
+    configs = copy.deepcopy(configs) # callers may mutate the result; keep the cached configs pristine
     if not configs:
         return {}
     merged = {
@@ -495,29 +342,149 @@ def load_all_project_configs(project_dir):
 def load_project_config(process_dir):
     merged = load_all_project_configs(process_dir)
     return merged.get("Exclude", []), merged.get("UseDefaultBackupPath", True)
-def collect_files(process_dir, dump_config, full_backup=False):
-    all_files = []
+def _is_project_config(rel_path):
+    return rel_path.rsplit('/', 1)[-1] == '.dump-project.json'
+def follows_symlinks():
+    # Symlinked directories are only walked when "FollowSymlinks" is set (dump-config.json or --follow-symlinks)
+    return bool(custom_config.get("FollowSymlinks", False))
+def collect_files(process_dir, dump_config, full_backup=False, matcher=None, stats=None, gitignore=None, project_config=None):
+    skipped_files = 0
+    walk_stats = {}
+    # When project_config is given, .dump-project.json excludes are merged into dump_config["Exclude"]. A fresh cached
+    # index is used when available; otherwise the configs are discovered during this walk, so a dump is one traversal.
+    # A discovered config's excludes take effect as soon as its directory is listed, so they prune its subtree.
+    discovered_configs = None
+    if project_config is not None and not full_backup:
+        merged = cached_project_configs(process_dir)
+        if merged is not None:
+            _apply_project_excludes(dump_config, merged)
+            project_config.update(merged)
+            matcher = None
+        else:
+            discovered_configs = {} # path -> config
     if full_backup:
-        for root, dirs, files in os.walk(process_dir):
-            for file in files:
-                all_files.append(os.path.join(root, file))
+        # Archives keep every path, hardlinked or not
+        entries = walk_project(process_dir, follow_symlinks=follows_symlinks(), stats=walk_stats, dedup_files=False)
     else:
-        for root, dirs, files in os.walk(process_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if should_include_file(file_path, dump_config, process_dir):
-                    all_files.append(file_path)
+        if matcher is None:
+            matcher = PathMatcher.from_config(dump_config)
+        # Fully excluded and git-ignored directories are pruned so their subtrees are never listed
+        def dir_filter(rel_dir):
+            if matcher.excludes_dir(rel_dir):
+                return False
+            return gitignore is None or not gitignore.is_ignored(rel_dir, True)
+        def on_dir(rel_dir, file_names):
+            nonlocal matcher
+            if gitignore is not None:
+                gitignore.note_listing(rel_dir, file_names)
+            if discovered_configs is not None and '.dump-project.json' in file_names:
+                path = os.path.join(process_dir, rel_dir, '.dump-project.json') if rel_dir else os.path.join(process_dir, '.dump-project.json')
+                for config in read_project_configs([path]):
+                    discovered_configs[path] = config
+                    excludes = [p for p in config.get("Exclude", []) if p not in dump_config["Exclude"]]
+                    if excludes:
+                        dump_config["Exclude"].extend(excludes)
+                        matcher = PathMatcher.from_config(dump_config)
+        def file_filter(relative_path):
+            nonlocal skipped_files
+            if gitignore is not None and gitignore.is_ignored(relative_path):
+                log_write(f"Excluded {relative_path} - Ignored by .gitignore")
+            elif should_include_relative(relative_path, matcher):
+                return True
+            skipped_files += 1
+            return False
+        entries = walk_project(process_dir, dir_filter=dir_filter, follow_symlinks=follows_symlinks(), stats=walk_stats, on_dir=on_dir, file_filter=file_filter)
+        if discovered_configs is not None:
+            merged = merge_project_configs([discovered_configs[path] for path in sorted(discovered_configs)])
+            if merged:
+                _apply_project_excludes(dump_config, merged)
+                project_config.update(merged)
+                matcher = PathMatcher.from_config(dump_config)
+    all_files = [entry.path for _, entry in entries]
+    if gitignore is not None:
+        log_message(f"Applied {gitignore.rule_count()} rules from .gitignore files")
+    if walk_stats["DuplicateDirs"] or walk_stats["DuplicateFiles"]:
+        log_message(f"Walk skipped {walk_stats['DuplicateDirs']} duplicate/looping directories and {walk_stats['DuplicateFiles']} hardlinked duplicates")
+    if not full_backup:
+        log_message(f"Filter skipped {walk_stats['PrunedDirs']} excluded directories and {skipped_files} files")
+    if stats is not None:
+        stats.update(walk_stats)
+        stats["SkippedFiles"] = skipped_files
     return all_files
+def _apply_project_excludes(dump_config, merged):
+    project_excludes = merged.get("Exclude", [])
+    dump_config["Exclude"].extend([p for p in project_excludes if p not in dump_config["Exclude"]])
+    if project_excludes:
+        log_message(f"Added {len(project_excludes)} project-specific exclude patterns")
+def collect_git_files(process_dir, dump_config, include_untracked=False, gitignore=None, stats=None, project_config=None):
+    # Lists tracked files straight from .git/index instead of walking the tree; untracked files are only walked
+    # for when asked. Falls back to collect_files outside a git checkout.
+    try:
+        tracked = tracked_files(process_dir)
+    except (OSError, ValueError, struct.error) as e:
+        log_message(f"Cannot read git index ({e}), walking the directory instead")
+        tracked = None
+    if tracked is None:
+        log_message(f"No git index found for {process_dir}, walking the directory instead")
+        return collect_files(process_dir, dump_config, stats=stats, gitignore=gitignore, project_config=project_config)
+    log_message(f"Read {len(tracked)} tracked files from git index")
+    if project_config is not None:
+        merged = cached_project_configs(process_dir)
+        if merged is None:
+            config_paths = [os.path.join(process_dir, rel.replace('/', os.sep)) for rel in tracked if rel == '.dump-project.json' or rel.endswith('/.dump-project.json')]
+            merged = merge_project_configs(read_project_configs(sorted(config_paths)))
+        if merged:
+            _apply_project_excludes(dump_config, merged)
+            project_config.update(merged)
+    matcher = PathMatcher.from_config(dump_config)
+    selected = {}
+    skipped_files = 0
+    missing_files = 0
+    for relative_path in tracked:
+        if not should_include_relative(relative_path, matcher):
+            skipped_files += 1
+            continue
+        abs_path = os.path.join(process_dir, relative_path.replace('/', os.sep))
+        if not os.path.isfile(abs_path): # deleted in the work tree but not yet staged
+            missing_files += 1
+            continue
+        selected[relative_path] = abs_path
+    walk_stats = {}
+    if include_untracked:
+        tracked_set = set(tracked)
+        def dir_filter(rel_dir):
+            if matcher.excludes_dir(rel_dir):
+                return False
+            return gitignore is None or not gitignore.is_ignored(rel_dir, True)
+        def on_dir(rel_dir, file_names):
+            if gitignore is not None:
+                gitignore.note_listing(rel_dir, file_names)
+        def file_filter(relative_path):
+            nonlocal skipped_files
+            if relative_path in tracked_set:
+                return False
+            if gitignore is not None and gitignore.is_ignored(relative_path):
+                log_write(f"Excluded {relative_path} - Ignored by .gitignore")
+            elif should_include_relative(relative_path, matcher):
+                return True
+            skipped_files += 1
+            return False
+        untracked = 0
+        for relative_path, entry in walk_project(process_dir, dir_filter=dir_filter, follow_symlinks=follows_symlinks(), stats=walk_stats, on_dir=on_dir, file_filter=file_filter):
+            selected[relative_path] = entry.path
+            untracked += 1
+        log_message(f"Added {untracked} untracked files")
+    if missing_files:
+        log_message(f"Skipped {missing_files} tracked files missing from the work tree")
+    log_message(f"Filter skipped {skipped_files} files")
+    if stats is not None:
+        stats.update(walk_stats)
+        stats["SkippedFiles"] = skipped_files
+    return [selected[rel] for rel in sorted(selected)]
 # --- Core Processing Functions Section ---
 def do_backup(project_dir, dump_config, full_backup=False, use_default_backup_path=True, parse_git=True):
-    project_excludes, _ = load_project_config(project_dir)
-    dump_config["Exclude"].extend([p for p in project_excludes if p not in dump_config["Exclude"]])
-    if parse_git and not full_backup:
-        git_path = os.path.join(project_dir, '.gitignore')
-        if os.path.exists(git_path):
-            git_excludes = parse_gitignore(git_path)
-            dump_config["Exclude"].extend([p for p in git_excludes if p not in dump_config["Exclude"]])
-    all_files = collect_files(project_dir, dump_config, full_backup)
+    gitignore = GitignoreEngine(project_dir) if parse_git and not full_backup else None
+    all_files = collect_files(project_dir, dump_config, full_backup, gitignore=gitignore, project_config={})
     if not all_files:
         return "No files to backup.", "red"
     project_name = os.path.basename(project_dir)
@@ -546,21 +513,307 @@ def create_archive(all_files, project_dir, backup_path):
             for file in all_files:
                 arcname = Path(file).relative_to(project_dir)
                 zipf.write(file, arcname)
-def _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files=None, progress_callback=None, full_backup=False):
+@contextlib.contextmanager
+def open_file_buffer(file_path, skip_binary=False):
+    # One read per file: small files are read into bytes, large ones are memory-mapped so they are never copied whole.
+    # Yields (data, is_binary) where is_binary comes from sniffing the first block; with skip_binary a binary file
+    # yields (None, True) and is never read past that block.
+    with open(file_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_size < MMAP_THRESHOLD:
+            head = f.read(SNIFF_SIZE)
+            is_binary = sniff_is_binary(file_path, st, head)
+            if is_binary and skip_binary:
+                yield None, True
+                return
+            yield head + f.read(), is_binary
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            is_binary = sniff_is_binary(file_path, st, mapped[:SNIFF_SIZE])
+            yield (None if is_binary and skip_binary else mapped), is_binary
+def decode_text(data):
+    # Same result as open(..., "r", encoding="utf-8").read(), including universal newline translation
+    with memoryview(data) as view:
+        text = str(view, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+def _load_file(file_path, relative_path, include_binary, previous_hash=None):
+    # Returns (sha256, is_binary, content, original_size); content is None for binary files when include_binary is off
+    # and "" when they are included (original_size is then the length of their base64 encoding)
+    # (sha256 is None too when the first block already showed the file is binary).
+    # Returns None when the file's hash equals previous_hash. Hashing, decoding and base64 share a single read.
+    with open_file_buffer(file_path, skip_binary=not include_binary) as (data, is_binary):
+        if data is None:
+            return None, True, None, 0 # Sniffed as binary; not worth hashing
+        file_hash = hashlib.sha256(data).hexdigest()
+        if file_hash == previous_hash:
+            return None
+        if not is_binary:
+            try:
+                original_content = decode_text(data)
+            except UnicodeDecodeError: # Binary content past the sniffed block
+                is_binary = True
+        if is_binary:
+            if not include_binary:
+                return file_hash, True, None, 0
+            # The base64 text is streamed from the file when the part is written; only its length is kept
+            log_write(f"Binary file {relative_path} will be streamed as base64")
+            return file_hash, True, "", base64_length(len(data))
+    return file_hash, False, original_content, len(original_content)
+def remove_stale_parts(output_dir, output_base, ext, part_count):
+    pattern = re.compile(re.escape(f"{output_base}-part-") + r"(\d+)" + re.escape(ext))
+    try:
+        names = os.listdir(output_dir)
+    except OSError:
+        return
+    for name in sorted(names):
+        match = pattern.fullmatch(name)
+        if match and int(match.group(1)) > part_count:
+            stale_path = os.path.join(output_dir, name)
+            try:
+                os.remove(stale_path)
+                log_message(f"Removed stale part {stale_path}")
+            except OSError as e:
+                log_message(f"Cannot remove stale part {stale_path}: {e}")
+def read_dump_manifest(manifest_path):
+    # Returns the previous dump's manifest ({"Options", "Files": {path: sha256}, "Parts": {section: part}}) or None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log_message(f"Cannot read dump manifest {manifest_path}: {e}")
+        return None
+def save_dump_manifest(manifest_path, file_hashes, part_numbers, options):
+    manifest = {"Created": datetime.now().isoformat(timespec="seconds"), "Options": options, "Files": dict(sorted(file_hashes.items())), "Parts": dict(sorted(part_numbers.items()))}
+    try:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        log_write(f"Dump manifest written to {manifest_path}")
+    except OSError as e:
+        log_message(f"Failed to write dump manifest {manifest_path}: {e}")
+def run_ordered(func, tasks, jobs):
+    # Yields (args, extra, result or exception) in task order. With jobs > 1 the calls run on a thread pool with a
+    # bounded look-ahead window, so memory stays flat and the output is identical to a serial run.
+    if jobs <= 1:
+        for args, extra in tasks:
+            try:
+                yield args, extra, func(*args)
+            except Exception as e:
+                yield args, extra, e
+        return
+    window = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for args, extra in tasks:
+            window.append((args, extra, pool.submit(func, *args)))
+            while len(window) >= jobs * 4:
+                args, extra, future = window.popleft()
+                yield args, extra, future.exception() or future.result()
+        while window:
+            args, extra, future = window.popleft()
+            yield args, extra, future.exception() or future.result()
+_cpu_pool = None # (key, ProcessPoolExecutor) kept for the next dump; see cpu_pool()
+def cpu_pool(jobs, size_unit):
+    # Worker processes for the CPU-bound part of the per-file stage: builtin minifiers, token counting and splitting.
+    # All of them are started before the file threads, so forking never copies a thread in the middle of its work,
+    # and they are kept for later dumps (watch mode, the GUI) with the same settings. None when they cannot start.
+    global _cpu_pool
+    key = (jobs, size_unit, logging.getLogger().getEffectiveLevel())
+    if _cpu_pool is not None:
+        if _cpu_pool[0] == key:
+            return _cpu_pool[1]
+        shutdown_cpu_pool()
+    try:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(custom_config, size_unit, key[2]))
+        list(pool.map(start_worker, range(jobs)))
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        log_message(f"Cannot start worker processes ({e}), processing files on threads only")
+        return None
+    _cpu_pool = (key, pool)
+    return pool
+def shutdown_cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool[1].shutdown(cancel_futures=True)
+        _cpu_pool = None
+atexit.register(shutdown_cpu_pool)
+def _build_file_items(file_path, relative_path, cached, previous_hash, minify, include_binary, include_hashes, ignore_size_limits, use_placeholders, split_large_files, single_file_limit, max_part_size, format_out, estimator, pool=None):
+    # Per-file stage of _process_dump; runs on worker threads. Returns (status, sha256, freshly loaded tuple for the
+    # file cache or None, file items) where status is "ok", "binary" (skipped) or "unchanged" (since the last dump).
+    # Reading, hashing and external minifiers stay on the thread; with a pool (see cpu_pool) the builtin minifiers
+    # and building the file's sections run in a worker process while the thread waits.
+    ext = Path(file_path).suffix
+    minify_mode_for_split = minify and minifier_registry.joins_lines(ext)
+    loaded = None
+    if cached is not None:
+        file_hash, is_binary, content, original_size = cached
+        if previous_hash is not None and file_hash == previous_hash:
+            return "unchanged", file_hash, None, []
+        log_write(f"Loaded {relative_path} from file cache")
+    else:
+        loaded = _load_file(file_path, relative_path, include_binary, previous_hash)
+        if loaded is None:
+            return "unchanged", previous_hash, None, []
+        file_hash, is_binary, content, original_size = loaded
+    if content is None:
+        log_write(f"Skipping binary file {relative_path}")
+        return "binary", file_hash, loaded, []
+    if is_binary:
+        return "ok", file_hash, loaded, _binary_file_items(file_path, relative_path, file_hash, original_size, include_hashes, ignore_size_limits, use_placeholders, split_large_files, single_file_limit, max_part_size, format_out, estimator)
+    lang = ext_to_lang.get(ext.lower(), "text")
+    build = dict(relative_path=relative_path, file_hash=file_hash, original_size=original_size, lang=lang, include_hashes=include_hashes, ignore_size_limits=ignore_size_limits,
+                 use_placeholders=use_placeholders, split_large_files=split_large_files, single_file_limit=single_file_limit, max_part_size=max_part_size, format_out=format_out,
+                 minify_mode=minify_mode_for_split)
+    pending = [] # In-process minifiers still to try (cached content is already minified)
+    if loaded is not None and minify and minifier_registry.handles(ext):
+        here, pending = minifier_registry.split_chain(ext) if pool is not None else (minifier_registry.chain(ext), [])
+        minified, backend = minifier_registry.run_chain(here, content)
+        if backend is not None:
+            _log_minified(relative_path, backend, content, minified)
+            content, pending = minified, []
+    file_items = None
+    # Files with CPU-bound work go to a worker process; in character mode only minifying and splitting are worth it
+    if pool is not None and (pending or estimator.unit != "chars" or (split_large_files and not ignore_size_limits and len(content) > single_file_limit)):
+        try:
+            minified, backend, stats, file_items, records = pool.submit(process_text, [(b.name, b.func, b.options) for b in pending], content, build).result()
+        except BrokenProcessPool:
+            log_write(f"Worker process lost, processing {relative_path} on this thread")
+        except Exception as e: # E.g. a plugin's output that does not pickle
+            log_message(f"Warning: Worker process failed on {relative_path} ({type(e).__name__}: {e}), processing it on this thread")
+        else:
+            for level, message, console in records:
+                logging.log(level, message, extra={"console": console})
+            for name, chars_in, chars_out, seconds in stats:
+                minifier_registry.backends[name].record(chars_in, chars_out, seconds)
+            if backend is not None:
+                _log_minified(relative_path, backend, content, minified)
+                content = minified
+    if file_items is None:
+        if pending:
+            minified, backend = minifier_registry.run_chain(pending, content)
+            if backend is not None:
+                _log_minified(relative_path, backend, content, minified)
+                content = minified
+        file_items = build_text_items(content, estimator=estimator, **build)
+    if loaded is not None:
+        loaded = (file_hash, False, content, original_size) # The file cache keeps the minified text
+    if ignore_size_limits and split_large_files and file_items:
+        # Used by _partition_fixed_parts when the parts cannot fit unless this file is split
+        file_items[-1]["Split"] = lambda size: split_large_file(content, relative_path, size, format_out, lang, include_hashes, file_hash, 1, minify_mode_for_split, estimator)
+    return "ok", file_hash, loaded, file_items
+def _log_minified(relative_path, backend, original, minified):
+    log_write(f"Minified {relative_path} with {backend}: {len(original)} -> {len(minified)} characters ({len(original) - len(minified)} saved)")
+def _binary_file_items(file_path, relative_path, file_hash, payload_length, include_hashes, ignore_size_limits, use_placeholders, split_large_files, single_file_limit, max_part_size, format_out, estimator):
+    # Binary sections never hold their base64 text: each records the range of the encoding it covers ("Payload") and
+    # write_part streams it from the file. Split sections follow split_large_file's chunking of one long line. The
+    # base64 is never read for sizing; the estimator sizes it from its length.
+    hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash else ""
+    header = f"## {relative_path}{hash_str}\n"
+    code_end = "\n```\n\n"
+    section_length = estimator.count(header) + estimator.count("``` base64\n") + estimator.base64_size(payload_length) + estimator.count(code_end)
+    def binary_section(section_path, prefix, start, end, tail, section_index, has_continuation):
+        return {
+            "RelativePath": section_path,
+            "FileSection": prefix,
+            "Payload": (file_path, start, end),
+            "SectionTail": tail,
+            "Length": estimator.count(prefix) + estimator.base64_size(end - start) + estimator.count(tail),
+            "OriginalPath": relative_path,
+            "SectionIndex": section_index,
+            "HasContinuation": has_continuation
+        }
+    if ignore_size_limits:
+        log_write(f"Added full file {relative_path} (size: {section_length}) ignoring size limits")
+        item = binary_section(relative_path, header + "``` base64\n", 0, payload_length, code_end, 1, False)
+        if split_large_files:
+            item["Split"] = lambda size: _binary_file_items(file_path, relative_path, file_hash, payload_length, include_hashes, False, False, True, size, max_part_size, format_out, estimator)
+        return [item]
+    if use_placeholders and section_length > single_file_limit:
+        placeholder_section = header + f"Large file ({payload_length} characters). Content omitted to optimize for AI context.\n\n"
+        log_write(f"Added placeholder for large file {relative_path} (size: {payload_length})")
+        return [{
+            "RelativePath": relative_path,
+            "FileSection": placeholder_section,
+            "Length": estimator.count(placeholder_section),
+            "OriginalPath": relative_path,
+            "SectionIndex": 1,
+            "HasContinuation": False
+        }]
+    if split_large_files and section_length > single_file_limit:
+        log_write(f"Splitting large file {relative_path} (size: {section_length})")
+        effective_max = estimator.base64_chars(single_file_limit - estimator.allowance(500))
+        chunk_size = max(4, estimator.base64_chars(single_file_limit - estimator.allowance(500) - estimator.allowance(200)))
+        bounds = [(0, payload_length)] if payload_length <= effective_max else [(start, min(start + chunk_size, payload_length)) for start in range(0, payload_length, chunk_size)]
+        sections = []
+        for section_index, (start, end) in enumerate(bounds, 1):
+            is_first_part = section_index == 1
+            has_more = end < payload_length
+            h = create_section_header(relative_path + hash_str if is_first_part else relative_path, is_first_part, section_index, format_out)
+            tail = ("\n# [CONTINUATION_PLACEHOLDER]\n" if has_more else "") + code_end
+            section_path = relative_path if is_first_part else f"Continuation of {relative_path} (Part {section_index})"
+            sections.append(binary_section(section_path, h + "``` base64\n", start, end, tail, section_index, has_more))
+            log_write(f"Added split section {section_path} (size: {sections[-1]['Length']})")
+        return sections
+    if section_length > max_part_size:
+        log_message(f"Warning: File {relative_path} exceeds max part size ({section_length} > {max_part_size}), skipping")
+        return []
+    log_write(f"Added non-split file {relative_path} (size: {section_length})")
+    return [binary_section(relative_path, header + "``` base64\n", 0, payload_length, code_end, 1, False)]
+def _partition_fixed_parts(file_items, part_count, max_part_size, single_file_limit, base_length, first_part_extra, toc_per_item, previous_parts, estimator):
+    # Exactly part_count parts with the largest as small as possible. While a part is over max_part_size, the largest
+    # splittable file in such a part is split (at single_file_limit, or in halves when it is smaller) and the items are
+    # partitioned again. Returns (parts, file_items with the split files replaced by their sections).
+    while True:
+        parts, lower_bound = partition_parts(file_items, part_count, base_length, first_part_extra, previous_parts)
+        largest = max(size for size, _ in parts)
+        total = sum(size for size, _ in parts)
+        if largest <= max_part_size or -(-total // part_count) > max_part_size: # Fits, or cannot fit however files are split
+            break
+        splittable = [item for size, part in parts if size > max_part_size for item in part if "Split" in item]
+        if not splittable:
+            break
+        item = max(splittable, key=lambda x: x["Length"])
+        split_size = min(single_file_limit, item["Length"] // 2 + estimator.allowance(1000))
+        sections = item.pop("Split")(split_size)
+        if len(sections) < 2:
+            continue
+        log_message(f"Split {item['OriginalPath']} into {len(sections)} sections to fit {part_count} parts")
+        for section in sections:
+            section["EffectiveLength"] = section["Length"] + toc_per_item
+        file_items = [x for x in file_items if x is not item] + sections
+    gap = 100 * (largest - lower_bound) / lower_bound if lower_bound else 0
+    log_message(f"Partitioned into {part_count} parts: largest {largest} {estimator.unit}, at most {gap:.1f}% above the best possible ({lower_bound})")
+    if largest > max_part_size:
+        needed = -(-(total - base_length * part_count - first_part_extra) // max(1, max_part_size - base_length))
+        if needed > part_count:
+            log_message(f"Warning: Part size {largest} exceeds max part size {max_part_size}; the files need at least {needed} parts to fit")
+        else:
+            log_message(f"Warning: Part size {largest} exceeds max part size {max_part_size}; some files are larger than a part and cannot be split")
+    for item in file_items:
+        item.pop("Split", None)
+    file_items.sort(key=lambda x: (x["OriginalPath"], x["SectionIndex"]))
+    return parts, file_items
+def _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files=None, progress_callback=None, full_backup=False, file_source="walk", include_untracked=False, use_cache=True, since_last=False, manifest_base=None, stable_parts=False, jobs=None, size_unit=None, packing=None, packing_slack=None, session_cache=None):
+    estimator = size_estimator(size_unit or default_size_unit)
     log_message(f"Processing directory: {process_dir}")
     log_message(f"Output directory: {output_dir}")
     log_message(f"Minify enabled: {minify}")
     log_message(f"Include hashes: {include_hashes}")
-    log_message(f"Max part size: {max_part_size}")
+    log_message(f"Max part size: {max_part_size} {estimator.unit} ({estimator.signature()})")
     log_message(f"Output format: {format_out}")
     log_message(f"Split large files: {split_large_files}")
     log_message(f"Use placeholders: {use_placeholders}")
-    log_message(f"Single file limit: {single_file_limit}")
+    log_message(f"Single file limit: {single_file_limit} {estimator.unit}")
     log_message(f"Include tree: {include_tree}")
     log_message(f"Parse .gitignore: {parse_git}")
     log_message(f"Max output parts: {max_output_parts}")
     log_message(f"Include binary: {include_binary}")
     log_message(f"Full backup: {full_backup}")
+    log_message(f"File source: {file_source}")
+    log_message(f"File cache: {use_cache}")
+    log_message(f"Since last dump: {since_last}")
     if progress_callback:
         progress_callback(f"Processing directory: {process_dir}", "blue")
     if not os.path.exists(process_dir):
@@ -570,25 +823,19 @@ def _process_dump(process_dir, output_dir, output_base, minify, include_hashes,
     exclude = apply_additional_excludes(exclude, exclude_cmake, exclude_vscode)
     # Apply dynamic patterns
     include_patterns, exclude = apply_dynamic_patterns(include_patterns, exclude, dynamic_patterns, is_exclude_dynamic)
-    # Load project-specific exclusions
-    project_excludes, use_default_backup_path = load_project_config(process_dir)
-    exclude.extend([p for p in project_excludes if p not in exclude])
-    if project_excludes:
-        log_message(f"Added {len(project_excludes)} project-specific exclude patterns")
-    # Parse .gitignore if enabled
-    if parse_git and not full_backup:
-        git_path = os.path.join(process_dir, '.gitignore')
-        if os.path.exists(git_path):
-            git_excludes = parse_gitignore(git_path)
-            exclude.extend([p for p in git_excludes if p not in exclude])
-            log_message(f"Added {len(git_excludes)} patterns from .gitignore")
+    # Apply .gitignore files at every level if enabled
+    gitignore = GitignoreEngine(process_dir) if parse_git and not full_backup else None
     dump_config = {"Extensions": extensions, "IncludePatterns": include_patterns, "Exclude": exclude}
     all_files = []
     if preset_files:
         all_files = [f for f in preset_files if os.path.exists(f)]
         log_message(f"Using preset with {len(all_files)} files")
     else:
-        all_files = collect_files(process_dir, dump_config, full_backup)
+        # Project-specific exclusions are loaded during the same walk
+        if file_source == "git-index" and not full_backup:
+            all_files = collect_git_files(process_dir, dump_config, include_untracked, gitignore=gitignore, project_config={})
+        else:
+            all_files = collect_files(process_dir, dump_config, full_backup, gitignore=gitignore, project_config={})
     log_message(f"Found {len(all_files)} files after filtering")
     # Build tree if requested
     tree_section = ""
@@ -600,137 +847,128 @@ def _process_dump(process_dir, output_dir, output_base, minify, include_hashes,
     total_files = len(all_files)
     ignore_size_limits = max_output_parts > 0
     if ignore_size_limits:
-        split_large_files = False
+        # Files stay whole; _partition_fixed_parts splits one only when the parts cannot fit otherwise
         use_placeholders = False
-    for current_file_index, file_path in enumerate(all_files, 1):
-        percent_complete = round((current_file_index / total_files) * 100)
-        log_message(f"Processing file {current_file_index}/{total_files} ({percent_complete}%)")
-        if progress_callback:
-            progress_callback(f"Processing file {current_file_index}/{total_files} ({percent_complete}%)", "blue")
-        try:
-            ext = Path(file_path).suffix
+    cache_options = f"minify={int(minify)};binary={int(include_binary)}"
+    if minify:
+        cache_options += ";" + minifier_registry.signature()
+    # Every dump records its file hashes so a later --since-last run can emit only what changed
+    manifest_path = os.path.join(output_dir, f"{manifest_base or output_base}-manifest.json")
+    previous_manifest = read_dump_manifest(manifest_path) if since_last or stable_parts else None
+    previous_hashes = None
+    if since_last:
+        if previous_manifest is None:
+            log_message(f"No previous dump manifest at {manifest_path}, dumping all files")
+        elif previous_manifest.get("Options") != cache_options:
+            log_message("Dump options changed since the last dump, dumping all files")
+        else:
+            previous_hashes = previous_manifest.get("Files", {})
+    # Stable mode keeps each section in the part it was in last time, so unchanged parts stay byte-identical
+    previous_parts = previous_manifest.get("Parts", {}) if stable_parts and previous_manifest else {}
+    current_hashes = {}
+    deleted_files = []
+    unchanged_files = modified_files = added_files = 0
+    if previous_hashes is not None:
+        present = {os.path.relpath(f, process_dir).replace('\\', '/') for f in all_files}
+        deleted_files = sorted(rel for rel in previous_hashes if rel not in present)
+    jobs = jobs or default_jobs
+    # Node workers only help when an external backend is in play
+    file_exts = {Path(f).suffix for f in all_files}
+    minifier_service.max_workers = jobs if minify and minifier_registry.has_external(file_exts) else 1
+    # Builtin minifiers and token counting hold the GIL, so they get worker processes; threads only overlap file I/O
+    pool = cpu_pool(jobs, size_unit or default_size_unit) if jobs > 1 and ((minify and minifier_registry.has_portable(file_exts)) or estimator.unit != "chars") else None
+    progress = ProgressReporter("Processing file", total_files)
+    build = functools.partial(_build_file_items, minify=minify, include_binary=include_binary, include_hashes=include_hashes, ignore_size_limits=ignore_size_limits,
+                              use_placeholders=use_placeholders, split_large_files=split_large_files, single_file_limit=single_file_limit, max_part_size=max_part_size, format_out=format_out,
+                              estimator=estimator, pool=pool)
+    def file_tasks():
+        # Cache lookups stay on this thread; everything that touches file contents runs in the pool
+        for file_path in all_files:
             relative_path = os.path.relpath(file_path, process_dir).replace('\\', '/')
-            minify_mode_for_split = minify and ext.lower() in [".js", ".ts", ".jsx", ".tsx", ".css", ".html", ".htm"]
-            file_hash = None
-            if include_hashes:
-                with open(file_path, "rb") as f:
-                    file_hash = hashlib.sha256(f.read()).hexdigest()
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    original_content = f.read()
-                content = original_content
-                if ext in [".js", ".ts", ".jsx", ".tsx", ".css", ".html", ".htm"]:
-                    content = minify_content(ext, content, minify)
-                    log_message(f"Processed {relative_path} (minify={minify})")
-                is_binary = False
-            except UnicodeDecodeError:
-                if not include_binary:
-                    log_message(f"Skipping binary file {relative_path}")
-                    continue
-                with open(file_path, "rb") as f:
-                    content = f.read()
-                content = base64.b64encode(content).decode('utf-8')
-                is_binary = True
-                log_message(f"Encoded binary file {relative_path} as base64")
-            lang = ext_to_lang.get(ext.lower(), "text") if not is_binary else "base64"
-            original_size = len(original_content) if not is_binary else len(content)
-            hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash else ""
-            header = f"## {relative_path}{hash_str}\n"
-            lang_str = lang if lang else ""
-            section_header = header + f"``` {lang_str}\n" if lang_str else header + f"```\n"
-            code_end = "\n```\n\n"
-            file_section = section_header + content + code_end
-            section_length = len(file_section)
-            if not ignore_size_limits:
-                if use_placeholders and section_length > single_file_limit:
-                    placeholder_section = header + f"Large file ({original_size} characters). Content omitted to optimize for AI context.\n\n"
-                    section_length = len(placeholder_section)
-                    file_items.append({
-                        "RelativePath": relative_path,
-                        "FileSection": placeholder_section,
-                        "Length": section_length,
-                        "OriginalPath": relative_path,
-                        "SectionIndex": 1,
-                        "HasContinuation": False
-                    })
-                    log_message(f"Added placeholder for large file {relative_path} (size: {original_size})")
-                elif split_large_files and section_length > single_file_limit:
-                    log_message(f"Splitting large file {relative_path} (size: {section_length})")
-                    split_sections = split_large_file(content, relative_path, single_file_limit, format_out, lang, include_hashes, file_hash, 1, minify_mode_for_split)
-                    for sec in split_sections:
-                        log_message(f"Added split section {sec['RelativePath']} (size: {sec['Length']})")
-                    file_items.extend(split_sections)
+            cached = stat_key = None
+            if file_cache is not None:
+                try:
+                    st = os.stat(file_path)
+                    stat_key = (st.st_size, st.st_mtime_ns)
+                    cached = file_cache.get(file_path, st.st_size, st.st_mtime_ns, cache_options)
+                except OSError:
+                    pass
+            previous_hash = previous_hashes.get(relative_path) if previous_hashes is not None else None
+            yield (file_path, relative_path, cached, previous_hash), stat_key
+    if jobs > 1:
+        log_message(f"Processing files with {jobs} worker threads" + (f" and {jobs} worker processes" if pool is not None else ""))
+    file_cache = open_file_cache(custom_config) if use_cache else None
+    if file_cache is None:
+        file_cache = session_cache
+    try:
+        for current_file_index, ((file_path, relative_path, _, _), stat_key, result) in enumerate(run_ordered(build, file_tasks(), jobs), 1):
+            percent_complete = round((current_file_index / total_files) * 100)
+            progress.update(current_file_index)
+            if progress_callback:
+                progress_callback(f"Processing file {current_file_index}/{total_files} ({percent_complete}%)", "blue")
+            if isinstance(result, Exception):
+                log_message(f"Error processing {file_path}: {result}")
+                if previous_hashes is not None and relative_path in previous_hashes:
+                    current_hashes[relative_path] = previous_hashes[relative_path] # Compared again next time rather than reported as added
+                continue
+            status, file_hash, loaded, items = result
+            if status == "unchanged":
+                current_hashes[relative_path] = file_hash
+                unchanged_files += 1
+                continue
+            if loaded is not None and stat_key is not None:
+                file_cache.put(file_path, stat_key[0], stat_key[1], cache_options, *loaded)
+            if status == "binary":
+                continue # Skipped binary files are not in the dump, so they are neither recorded nor counted as changes
+            if previous_hashes is not None:
+                if relative_path in previous_hashes:
+                    modified_files += 1
                 else:
-                    if section_length > max_part_size:
-                        log_message(f"Warning: File {relative_path} exceeds max part size ({section_length} > {max_part_size}), skipping")
-                        continue
-                    file_items.append({
-                        "RelativePath": relative_path,
-                        "FileSection": file_section,
-                        "Length": section_length,
-                        "OriginalPath": relative_path,
-                        "SectionIndex": 1,
-                        "HasContinuation": False
-                    })
-                    log_message(f"Added non-split file {relative_path} (size: {section_length})")
-            else:
-                file_items.append({
-                    "RelativePath": relative_path,
-                    "FileSection": file_section,
-                    "Length": section_length,
-                    "OriginalPath": relative_path,
-                    "SectionIndex": 1,
-                    "HasContinuation": False
-                })
-                log_message(f"Added full file {relative_path} (size: {section_length}) ignoring size limits")
-        except Exception as e:
-            log_message(f"Error processing {file_path}: {e}")
+                    added_files += 1
+            current_hashes[relative_path] = file_hash
+            file_items.extend(items)
+    finally:
+        if file_cache is not None:
+            file_cache.close()
+    if minify:
+        minifier_service.finish_run()
+        minifier_registry.finish_run()
+    estimator_report = estimator.report()
+    if estimator_report:
+        logging.info(estimator_report, extra={"console": True})
+        estimator.reset_stats()
+    if previous_hashes is not None:
+        log_message(f"Changes since last dump: {added_files} added, {modified_files} modified, {len(deleted_files)} deleted, {unchanged_files} unchanged")
     # Sort file_items
     file_items.sort(key=lambda x: (x["OriginalPath"], x["SectionIndex"]))
-    log_message("Queue before packing:")
-    for item in file_items:
-        log_message(f" - {item['RelativePath']} (size: {item['Length']}, SectionIndex: {item['SectionIndex']})")
+    if debug_enabled():
+        log_write("Queue before packing:")
+        for item in file_items:
+            log_write(f" - {item['RelativePath']} (size: {item['Length']}, SectionIndex: {item['SectionIndex']})")
     # Prepare for packing with effective lengths to account for TOC and tree
-    base_length = len(f"# Project File Dump (Part 1)\n\nThis file contains a dump of relevant project files (Part 1).\n\n") + 200 # Base header + margin
-    tree_len = len(tree_section) if include_tree else 0
-    toc_per_item = 50 # Estimate for TOC lines
+    base_length = estimator.count(f"# Project File Dump (Part 1)\n\nThis file contains a dump of relevant project files (Part 1).\n\n") + estimator.allowance(200) # Base header + margin
+    tree_len = estimator.count(tree_section) if include_tree else 0
+    toc_per_item = estimator.allowance(50) # Estimate for TOC lines
     for item in file_items:
         item["EffectiveLength"] = item["Length"] + toc_per_item
     # Filter out items too large for any part (only if not ignoring sizes)
     if not ignore_size_limits:
-        file_items = [item for item in file_items if item["Length"] <= max_part_size - base_length - 1000]
-    # First-Fit Decreasing bin packing, with max_output_parts limit
-    parts = [] # list of (current_effective, list_of_items)
-    sorted_items = sorted(file_items, key=lambda x: x["EffectiveLength"], reverse=True)
-    is_first_part = True
+        file_items = [item for item in file_items if item["Length"] <= max_part_size - base_length - estimator.allowance(1000)]
+    # Best-Fit Decreasing bin packing, or a fixed number of parts with max_output_parts
     if max_output_parts > 0:
-        # Force into max_output_parts bins, even if over size (ignore size limits)
-        parts = [(0, []) for _ in range(max_output_parts)]
-        for item in sorted_items:
-            # Find bin with smallest current length
-            min_bin = min(range(max_output_parts), key=lambda i: parts[i][0])
-            cl, clist = parts[min_bin]
-            parts[min_bin] = (cl + item["EffectiveLength"], clist + [item])
+        parts, file_items = _partition_fixed_parts(file_items, max_output_parts, max_part_size, single_file_limit, base_length, tree_len if include_tree else 0, toc_per_item, previous_parts, estimator)
+    elif (packing or default_packing) == "locality" and not previous_parts:
+        # Stable mode keeps the previous layout through pack_best_fit, so locality only shapes the first run
+        parts, layout, best_fit_parts = pack_by_locality(file_items, max_part_size, base_length, tree_len if include_tree else 0, default_packing_slack if packing_slack is None else packing_slack)
+        log_message(f"Locality packing: {len(parts)} parts by {layout} (best fit needs {best_fit_parts})")
     else:
-        for item in sorted_items:
-            placed = False
-            for i in range(len(parts)):
-                cl, clist = parts[i]
-                effective_max = max_part_size - (tree_len if i == 0 and include_tree else 0)
-                if cl + item["EffectiveLength"] <= effective_max:
-                    parts[i] = (cl + item["EffectiveLength"], clist + [item])
-                    placed = True
-                    break
-            if not placed:
-                base = base_length + (tree_len if is_first_part and include_tree else 0)
-                parts.append((base + item["EffectiveLength"], [item]))
-                is_first_part = False
+        parts = pack_best_fit(file_items, max_part_size, base_length, tree_len if include_tree else 0, previous_parts)
     # Assign part numbers
     for part_num, (cl, part) in enumerate(parts, 1):
         for item in part:
             item["PartNumber"] = part_num
     # Update continuations
-    log_message("Updating continuation placeholders:")
+    log_write("Updating continuation placeholders:")
     grouped = defaultdict(list)
     for item in file_items:
         grouped[item["OriginalPath"]].append(item)
@@ -745,16 +983,19 @@ def _process_dump(process_dir, output_dir, output_base, minify, include_hashes,
                     placeholder_pattern = re.compile(r'^# \[CONTINUATION_PLACEHOLDER\]$', re.MULTILINE)
                     new_note = f"# {orig} continues in part {next_part}"
                     current["FileSection"] = placeholder_pattern.sub(new_note, current["FileSection"])
-                    log_message(f"Updated placeholder for {orig} section {current['SectionIndex']} to point to part {next_part}")
+                    if "SectionTail" in current:
+                        current["SectionTail"] = placeholder_pattern.sub(new_note, current["SectionTail"])
+                    log_write(f"Updated placeholder for {orig} section {current['SectionIndex']} to point to part {next_part}")
     all_files_summary = list(set(item["OriginalPath"] for item in file_items))
     log_message("Final parts:")
     for p, (cl, part) in enumerate(parts, 1):
-        log_message(f"Part {p}: {len(part)} items (total size: {cl})")
+        log_message(f"Part {p}: {len(part)} items (total size: {cl} {estimator.unit})")
         for item in part:
-            log_message(f" - {item['RelativePath']} (size: {item['Length']}, PartNumber: {item['PartNumber']})")
+            log_write(f" - {item['RelativePath']} (size: {item['Length']}, PartNumber: {item['PartNumber']})")
     os.makedirs(output_dir, exist_ok=True)
     base_header = f"# Project File Dump (Part {{0}})\n\nThis file contains a dump of relevant project files (Part {{0}}).\n\n"
     ext = "." + format_out
+    part_sizes = []
     for part_num, (cl, part) in enumerate(parts, 1):
         current_content = base_header.format(part_num)
         if include_tree and part_num == 1:
@@ -764,29 +1005,38 @@ def _process_dump(process_dir, output_dir, output_base, minify, include_hashes,
             toc += f"- {item['RelativePath']}\n"
         toc += "\n"
         current_content += toc
-        for item in part:
-            current_content += item["FileSection"]
+        part_sizes.append(estimator.count(current_content) + sum(item["Length"] for item in part))
         output_path = os.path.join(output_dir, f"{output_base}-part-{part_num}{ext}")
         log_message(f"Writing to: {output_path}")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(current_content)
+        # Sections are streamed to the file one at a time, so a part is never assembled in memory
+        if not write_part(output_path, current_content, part, only_if_changed=stable_parts):
+            log_message(f"Project dump part {part_num} unchanged, not rewritten")
+            continue
         log_message(f"Project dump part {part_num} written to {output_path} with {len(part)} files/sections")
+    # Parts numbered beyond this run's, left by an earlier run (a full dump before a --since-last delta, or parts
+    # that emptied out), would otherwise pass for part of this dump
+    remove_stale_parts(output_dir, output_base, ext, max(len(parts), 1))
     if not parts:
         output_path = os.path.join(output_dir, f"{output_base}-part-1{ext}")
         log_message(f"Writing empty dump to: {output_path}")
-        empty_content = "# Project File Dump (Part 1)\n\nNo relevant project files found.\n"
+        empty_content = "# Project File Dump (Part 1)\n\nNo relevant project files found.\n" if previous_hashes is None else "# Project File Dump (Part 1)\n\nNo files changed since the last dump.\n"
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(empty_content)
-    if parts:
+    if parts or deleted_files:
         summary_path = os.path.join(output_dir, f"{output_base}-summary.md")
         summary_content = "# Project Dump Summary\n\n"
+        if previous_hashes is not None:
+            summary_content += f"## Changes Since Last Dump: {added_files} added, {modified_files} modified, {len(deleted_files)} deleted\n\n"
         summary_content += f"## Total Files: {len(all_files_summary)}\n"
-        summary_content += f"## Total Parts: {len(parts)}\n\n"
+        summary_content += f"## Total Parts: {len(parts)}\n"
+        if estimator.unit != "chars":
+            summary_content += f"## Total Size: {sum(part_sizes)} {estimator.unit} ({estimator.signature()})\n"
+        summary_content += "\n"
         if include_tree:
             summary_content += tree_section
         summary_content += "## Files by Part\n\n"
         for p in range(1, len(parts) + 1):
-            summary_content += f"### Part {p}\n"
+            summary_content += f"### Part {p}\n" if estimator.unit == "chars" else f"### Part {p} ({part_sizes[p - 1]} {estimator.unit})\n"
             part_items = [item for item in file_items if item.get("PartNumber") == p]
             for item in part_items:
                 summary_content += f"- [{item['RelativePath']}]({output_base}-part-{p}{ext})\n"
@@ -794,14 +1044,20 @@ def _process_dump(process_dir, output_dir, output_base, minify, include_hashes,
         summary_content += "## All Files\n\n"
         for f in sorted(all_files_summary):
             summary_content += f"- {f}\n"
+        if deleted_files:
+            summary_content += "\n## Deleted Files\n\n"
+            for f in deleted_files:
+                summary_content += f"- {f}\n"
         with open(summary_path, "w", encoding="utf-8") as f:
             f.write(summary_content)
         log_message(f"Summary written to: {summary_path}")
+    save_dump_manifest(manifest_path, current_hashes, {item["RelativePath"]: item["PartNumber"] for item in file_items if "PartNumber" in item}, cache_options)
     log_message(f"Script completed successfully. Total parts: {len(parts)}")
     return f"Completed! Check {log_path} for details. Output in {output_dir}.", "green"
-def run_dump(start_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, input_type, use_placeholders, include_tree, parse_git, timestamp, max_output_parts, include_binary=False, preset_files=None, progress_callback=None, full_backup=False):
+def run_dump(start_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, input_type, use_placeholders, include_tree, parse_git, timestamp, max_output_parts, include_binary=False, preset_files=None, progress_callback=None, full_backup=False, file_source="walk", include_untracked=False, use_cache=True, since_last=False, manifest_base=None, stable_parts=False, jobs=None, size_unit=None, packing=None, packing_slack=None, session_cache=None):
     original_input = start_dir
     project_root = None
+    manifest_base = manifest_base or output_base # Timestamped dumps still compare against the same manifest
     if timestamp:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_base = f"{output_base}_{ts}"
@@ -816,7 +1072,7 @@ def run_dump(start_dir, output_dir, output_base, minify, include_hashes, max_par
                 subprocess.check_call(["git", "clone", "--depth=1", start_dir, "."], cwd=temp_dir, capture_output=True, check=True)
                 process_dir = temp_dir
                 log_message(f"Cloned GitHub repo to temp dir: {process_dir}")
-                return _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files, progress_callback, full_backup)
+                return _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files, progress_callback, full_backup, file_source, include_untracked, False, since_last, manifest_base, stable_parts, jobs, size_unit, packing, packing_slack, session_cache)
             except subprocess.CalledProcessError as e:
                 log_message(f"Git clone failed: {e}")
                 return "Failed to clone GitHub repository.", "red"
@@ -829,9 +1085,50 @@ def run_dump(start_dir, output_dir, output_base, minify, include_hashes, max_par
         output_dir = os.path.abspath(output_dir)
         if project_root and (output_dir == os.getcwd() or output_dir == os.path.abspath(original_input)):
             output_dir = os.path.abspath(process_dir)
-        return _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files, progress_callback, full_backup)
+        return _process_dump(process_dir, output_dir, output_base, minify, include_hashes, max_part_size, format_out, split_large_files, single_file_limit, extensions, include_patterns, exclude, exclude_cmake, exclude_vscode, dynamic_patterns, is_exclude_dynamic, use_placeholders, include_tree, parse_git, max_output_parts, include_binary, preset_files, progress_callback, full_backup, file_source, include_untracked, use_cache, since_last, manifest_base, stable_parts, jobs, size_unit, packing, packing_slack, session_cache)
+def watch_dump(params):
+    # Re-runs the dump whenever relevant files change. Parts are packed in stable mode so a change only rewrites the
+    # parts that hold the changed files, and the file cache (or, without it, an in-memory session cache) keeps
+    # unchanged files from being re-read or re-minified. A failed rebuild is logged and watching goes on.
+    params = dict(params, stable_parts=True, timestamp=False, since_last=False, progress_callback=None, session_cache=SessionFileCache())
+    start_dir = params["start_dir"]
+    project_dir = os.path.dirname(start_dir) if os.path.isfile(start_dir) else start_dir
+    output_base = params["output_base"]
+    output_names = (f"{output_base}-part-", f"{output_base}-summary.md", f"{output_base}-manifest.json")
+    exclude = apply_additional_excludes(params["exclude"], params["exclude_cmake"], params["exclude_vscode"])
+    matcher = PathMatcher(params["extensions"], params["include_patterns"], exclude)
+    def dir_filter(rel_dir):
+        return rel_dir.rsplit('/', 1)[-1] != '.git' and not matcher.excludes_dir(rel_dir)
+    def is_relevant(rel_path):
+        if not rel_path: # event queue overflowed
+            return True
+        name = rel_path.rsplit('/', 1)[-1]
+        if name.startswith(output_names):
+            return False
+        if name in ('.gitignore', '.dump-project.json') or matcher.includes(rel_path):
+            return True
+        abs_path = os.path.join(project_dir, rel_path)
+        # Directory events (created, moved or deleted trees) can add or remove dumped files
+        return os.path.isdir(abs_path) or (not os.path.exists(abs_path) and not Path(name).suffix)
+    def rebuild(changed):
+        if changed is not None:
+            shown = ", ".join(sorted(changed)[:5]) + (f" and {len(changed) - 5} more" if len(changed) > 5 else "")
+            log_message(f"Change detected: {shown}")
+        start = datetime.now()
+        try:
+            message, color = run_dump(**params)
+        except Exception as e:
+            logging.debug("Rebuild failed", exc_info=True)
+            log_message(f"Rebuild failed: {e}; still watching for changes")
+            return
+        log_message(f"{message} ({(datetime.now() - start).total_seconds():.2f}s)")
+    rebuild(None)
+    log_message("Watching for changes, press Ctrl+C to stop")
+    watch_project(project_dir, rebuild, dir_filter=dir_filter, is_relevant=is_relevant, follow_symlinks=follows_symlinks())
+    return 0
 def cli_run(args):
-    # Construct params from args and custom_config (updated in main for profiles)
+    # Construct params from args and custom_config (updated in main for profiles). Messages go through log_message:
+    # the logging listener thread writes the console, so print() here could overtake or split lines still queued there
     start_dir = args.input if args.input is not None else os.getcwd()
     output_dir = None
     output_base = args.output_base
@@ -863,45 +1160,59 @@ def cli_run(args):
         preset_files = [os.path.join(project_dir, rel.replace('/', os.sep)) for rel in presets[args.preset]]
     if args.backup:
         if args.input_type == "GitHub":
-            print("Backup not supported for GitHub input.")
+            log_message("Backup not supported for GitHub input.")
             return 1
         project_dir = os.path.dirname(start_dir) if os.path.isfile(start_dir) else start_dir
         dump_config = {"Extensions": extensions, "IncludePatterns": include_patterns, "Exclude": exclude}
         message, color = do_backup(project_dir, dump_config, args.full_backup, default_use_default_backup_path, args.parse_git)
-        print(message)
+        log_message(message)
         return 0 if "created" in message.lower() else 1
+    params = dict(
+        start_dir=start_dir,
+        output_dir=output_dir,
+        output_base=output_base,
+        minify=args.minify,
+        include_hashes=args.hashes,
+        max_part_size=args.max_part_size,
+        format_out=args.format,
+        split_large_files=split_large_files,
+        single_file_limit=args.single_file_limit,
+        extensions=extensions,
+        include_patterns=include_patterns,
+        exclude=exclude,
+        exclude_cmake=True, # default
+        exclude_vscode=True, # default
+        dynamic_patterns=[], # no CLI support
+        is_exclude_dynamic=False,
+        input_type=args.input_type,
+        use_placeholders=args.use_placeholders,
+        include_tree=args.include_tree,
+        parse_git=args.parse_git,
+        timestamp=args.timestamp,
+        max_output_parts=args.max_output_parts,
+        include_binary=args.include_binary,
+        preset_files=preset_files,
+        full_backup=args.full_backup,
+        file_source=args.file_source,
+        include_untracked=args.include_untracked,
+        use_cache=not args.no_cache,
+        since_last=args.since_last,
+        jobs=args.jobs,
+        size_unit=args.size_unit,
+        packing=args.packing,
+        packing_slack=args.packing_slack
+    )
+    if args.watch:
+        if args.input_type == "GitHub":
+            log_message("Watch mode is only supported for local input.")
+            return 1
+        return watch_dump(params)
     try:
-        message, color = run_dump(
-            start_dir=start_dir,
-            output_dir=output_dir,
-            output_base=output_base,
-            minify=args.minify,
-            include_hashes=args.hashes,
-            max_part_size=args.max_part_size,
-            format_out=args.format,
-            split_large_files=split_large_files,
-            single_file_limit=args.single_file_limit,
-            extensions=extensions,
-            include_patterns=include_patterns,
-            exclude=exclude,
-            exclude_cmake=True, # default
-            exclude_vscode=True, # default
-            dynamic_patterns=[], # no CLI support
-            is_exclude_dynamic=False,
-            input_type=args.input_type,
-            use_placeholders=args.use_placeholders,
-            include_tree=args.include_tree,
-            parse_git=args.parse_git,
-            timestamp=args.timestamp,
-            max_output_parts=args.max_output_parts,
-            include_binary=args.include_binary,
-            preset_files=preset_files,
-            full_backup=args.full_backup
-        )
+        message, color = run_dump(**params)
     except ValueError as e:
-        print(f"Error in CLI: {e}")
+        log_message(f"Error in CLI: {e}")
         return 1
-    print(message)
+    log_message(message)
     return 0 if "Completed" in message else 1
 def save_config(custom_config):
     with open(config_path, "w", encoding="utf-8") as f:
@@ -0,0 +1,102 @@
+# dump_logging.py
+# --- Imports Section ---
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+# --- Constants Section ---
+LOG_DIR = Path(__file__).parent / "logs"
+LOG_KEEP = 20 # Per-run log files kept in LOG_DIR
+PROGRESS_INTERVAL = 0.2 # Seconds between console progress line refreshes
+# --- Handlers Section ---
+class ConsoleHandler(logging.StreamHandler):
+    # Prints log_message() output and warnings; progress records rewrite a single line on terminals.
+    # Runs on the listener thread only, so progress and normal lines never interleave.
+    def __init__(self, stream=None):
+        super().__init__(stream or sys.stdout)
+        self.line_open = False
+        self.last_len = 0
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            stream = self.stream
+            is_tty = hasattr(stream, "isatty") and stream.isatty()
+            if getattr(record, "progress", False):
+                if is_tty:
+                    stream.write("\r" + msg.ljust(self.last_len))
+                    self.line_open = True
+                    self.last_len = len(msg)
+                elif getattr(record, "milestone", False):
+                    stream.write(msg + "\n")
+            else:
+                if self.line_open:
+                    stream.write("\n")
+                    self.line_open = False
+                    self.last_len = 0
+                stream.write(msg + "\n")
+            self.flush()
+        except Exception:
+            self.handleError(record)
+def _console_filter(record):
+    return record.levelno >= logging.WARNING or getattr(record, "console", False) or getattr(record, "progress", False)
+def _file_filter(record):
+    return not getattr(record, "progress", False)
+# --- Setup Section ---
+log_path = None
+_listener = None
+def _prune_old_logs():
+    logs = sorted(LOG_DIR.glob("dump-project-*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in logs[LOG_KEEP:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+def setup_logging(level=logging.INFO):
+    # One log file per run, written by a background QueueListener so logging never blocks the dump pipeline
+    global log_path, _listener
+    if _listener is not None:
+        return log_path
+    LOG_DIR.mkdir(exist_ok=True)
+    _prune_old_logs()
+    log_path = LOG_DIR / f"dump-project-{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}.log"
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    file_handler.addFilter(_file_filter)
+    console_handler = ConsoleHandler()
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    console_handler.addFilter(_console_filter)
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return log_path
+def set_log_level(level):
+    logging.getLogger().setLevel(level.upper() if isinstance(level, str) else level)
+def debug_enabled():
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
+# --- Progress Section ---
+class ProgressReporter:
+    # Throttled console progress line; the per-file detail goes to the log at DEBUG instead
+    def __init__(self, label, total):
+        self.label = label
+        self.total = total
+        self.last_time = 0.0
+        self.last_percent = -1
+    def update(self, current):
+        percent = round((current / self.total) * 100) if self.total else 100
+        now = time.monotonic()
+        milestone = percent // 10 != self.last_percent // 10 or current == self.total
+        if not milestone and (percent == self.last_percent or now - self.last_time < PROGRESS_INTERVAL):
+            return
+        self.last_time = now
+        self.last_percent = percent
+        logging.info(f"{self.label} {current}/{self.total} ({percent}%)", extra={"progress": True, "milestone": milestone})
+# TODO (Enhancement): Expose the log level and retained log count in the GUI.
@@ -36,7 +36,19 @@ def main():
     parser.add_argument("--include-binary", action="store_true", default=False)
     parser.add_argument("--full-backup", action="store_true", default=False)
     parser.add_argument("--input-type", choices=["Local", "GitHub"], default="Local")
+    parser.add_argument("--file-source", choices=["walk", "git-index"], default="walk", help="git-index lists tracked files from .git/index instead of walking the tree")
+    parser.add_argument("--include-untracked", action="store_true", default=False, help="With --file-source git-index, also add untracked files not ignored by .gitignore")
+    parser.add_argument("--since-last", action="store_true", default=False, help="Dump only files added or modified since the previous dump, plus a list of deleted files")
+    parser.add_argument("--watch", action="store_true", default=False, help="Keep running and regenerate the dump whenever project files change")
+    parser.add_argument("--size-unit", choices=["chars", "tokens"], default=default_size_unit, help="Unit of --max-part-size and --single-file-limit; tokens are estimated (see TokenEstimator in dump-config.json)")
+    parser.add_argument("--packing", choices=["size", "locality"], default=default_packing, help="locality keeps files of one directory in the same part, at the cost of up to --packing-slack extra parts")
+    parser.add_argument("--packing-slack", type=float, default=default_packing_slack, help="Extra parts locality packing may use, as a fraction of the parts best fit needs (0.1 = 10%%)")
+    parser.add_argument("--follow-symlinks", action="store_true", default=False, help="Also walk symlinked directories (loops and duplicate subtrees are skipped)")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs, help="Worker threads for reading and hashing files, and as many worker processes for the builtin minifiers and token counting (1 = serial)")
+    parser.add_argument("--no-cache", action="store_true", default=False, help="Re-read and re-minify every file instead of using dump-cache.sqlite")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING"], default=custom_config.get("LogLevel", "INFO"), help="DEBUG adds per-file detail to the run log")
     args = parser.parse_args()
+    set_log_level(args.log_level)
     # Update config with args for GUI prefill (non-path settings only)
     custom_config["LastMinify"] = args.minify
     custom_config["LastIncludeHashes"] = args.hashes
@@ -56,6 +68,8 @@ def main():
         custom_config["IncludePatterns"] = parse_list(args.include)
     if args.exclude:
         custom_config["Exclude"] = parse_list(args.exclude)
+    if args.follow_symlinks:
+        custom_config["FollowSymlinks"] = True
     # Reload defaults after update
     default_start_dir = custom_config.get("LastStartDir", os.getcwd())
     default_output_dir = custom_config.get("LastOutputDir", default_start_dir)
@@ -99,10 +113,10 @@ def main():
             root.mainloop()
             return 0
         except ImportError as e:
-            print(f"GUI not available ({e}). Falling back to CLI.")
+            log_message(f"GUI not available ({e}). Falling back to CLI.")
             return cli_run(args)
         except Exception as e:
-            print(f"GUI error: {e}. Falling back to CLI.")
+            log_message(f"GUI error: {e}. Falling back to CLI.")
             return cli_run(args)
     # TODO (Enhancement): Add --version flag and --help with examples for CLI.
     # TODO (Feature): Support batch mode for multiple inputs via --input-list file.
@@ -0,0 +1,151 @@
+# file_cache.py
+# --- Imports Section ---
+import os
+import sqlite3
+import time
+import logging
+from pathlib import Path
+# --- Constants Section ---
+CACHE_PATH = Path(__file__).parent / "dump-cache.sqlite" # Kept next to dump-config.json
+SCHEMA_VERSION = 1
+DEFAULT_MAX_MB = 256
+DEFAULT_MAX_AGE_DAYS = 30
+COMMIT_EVERY = 200 # Puts written per transaction; the write lock is only held while a batch is flushed
+# --- Cache Section ---
+class FileCache:
+    # Per-file results of the read/hash/decode/minify stage, keyed by absolute path and output options.
+    # An entry is only served while the file's size and mtime_ns are unchanged.
+    def __init__(self, db_path=CACHE_PATH, max_mb=DEFAULT_MAX_MB, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.db_path = str(db_path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.used = [] # (path, options) served this run; last_used is bumped in one batch on close()
+        self.pending = [] # Rows put since the last flush
+        self.failed = False # Set on the first database error; the rest of the run is processed uncached
+        self.conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS files (
+            path TEXT NOT NULL,
+            options TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT,
+            is_binary INTEGER NOT NULL,
+            content TEXT,
+            original_size INTEGER NOT NULL,
+            stored_bytes INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (path, options))""")
+        self.conn.commit()
+    def get(self, path, size, mtime_ns, options):
+        # Returns (sha256, is_binary, content, original_size) or None; content is None for skipped binary files
+        if self.failed:
+            return None
+        try:
+            row = self.conn.execute("SELECT size, mtime_ns, sha256, is_binary, content, original_size FROM files WHERE path=? AND options=?", (path, options)).fetchone()
+        except sqlite3.Error as e:
+            self._fail(e)
+            return None
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used.append((path, options))
+        return row[2], bool(row[3]), row[4], row[5]
+    def put(self, path, size, mtime_ns, options, sha256, is_binary, content, original_size):
+        if self.failed:
+            return
+        stored_bytes = len(content) if content is not None else 0
+        self.pending.append((path, options, size, mtime_ns, sha256, int(is_binary), content, original_size, stored_bytes, time.time()))
+        if len(self.pending) >= COMMIT_EVERY:
+            self.flush()
+    def flush(self):
+        # Writes the pending puts in one short transaction, so a concurrent dump waits for the lock only briefly
+        if self.failed or not self.pending:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.pending)
+        except sqlite3.Error as e:
+            self._fail(e)
+        self.pending = []
+    def _fail(self, error):
+        # A locked or broken database only costs this run its cache: files are read and minified as if it were off
+        logging.warning(f"File cache unavailable, processing the remaining files uncached: {error}")
+        self.failed = True
+        self.pending = []
+    def evict(self):
+        # Drops entries unused for max_age, then the least recently used ones until the cache fits in max_bytes
+        removed = self.conn.execute("DELETE FROM files WHERE last_used < ?", (time.time() - self.max_age,)).rowcount
+        total = self.conn.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM files").fetchone()[0]
+        if total > self.max_bytes:
+            doomed = []
+            for path, options, stored_bytes in self.conn.execute("SELECT path, options, stored_bytes FROM files ORDER BY last_used"):
+                if total <= self.max_bytes:
+                    break
+                doomed.append((path, options))
+                total -= stored_bytes
+            self.conn.executemany("DELETE FROM files WHERE path=? AND options=?", doomed)
+            removed += len(doomed)
+        return removed
+    def close(self):
+        try:
+            self.flush()
+            if self.failed:
+                return
+            now = time.time()
+            self.conn.executemany("UPDATE files SET last_used=? WHERE path=? AND options=?", [(now, path, options) for path, options in self.used])
+            removed = self.evict()
+            self.conn.commit()
+            logging.info(f"File cache: {self.hits} hits, {self.misses} misses, {removed} entries evicted")
+        except sqlite3.Error as e:
+            logging.warning(f"File cache could not be saved: {e}")
+        finally:
+            self.conn.close()
+# --- Session Cache Section ---
+class SessionFileCache:
+    # In-memory stand-in for FileCache that lives as long as a watch session, so rebuilds only re-process changed
+    # files even when the persistent cache is off (--no-cache, "FileCache": false) or unusable. Same interface;
+    # close() forgets files that were not seen in the run, so deleted files do not pile up.
+    def __init__(self):
+        self.entries = {} # (path, options) -> (size, mtime_ns, (sha256, is_binary, content, original_size))
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+    def get(self, path, size, mtime_ns, options):
+        entry = self.entries.get((path, options))
+        if entry is None or entry[0] != size or entry[1] != mtime_ns:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.seen.add((path, options))
+        return entry[2]
+    def put(self, path, size, mtime_ns, options, sha256, is_binary, content, original_size):
+        self.entries[(path, options)] = (size, mtime_ns, (sha256, is_binary, content, original_size))
+        self.seen.add((path, options))
+    def close(self):
+        self.entries = {key: entry for key, entry in self.entries.items() if key in self.seen}
+        logging.info(f"Session cache: {self.hits} hits, {self.misses} misses, {len(self.entries)} files kept")
+        self.seen = set()
+        self.hits = self.misses = 0
+def open_file_cache(config=None):
+    # Returns None when the cache is disabled or unusable, so callers simply process every file
+    config = config or {}
+    if not config.get("FileCache", True):
+        return None
+    try:
+        return FileCache(CACHE_PATH, config.get("FileCacheMaxMB", DEFAULT_MAX_MB), config.get("FileCacheMaxAgeDays", DEFAULT_MAX_AGE_DAYS))
+    except sqlite3.Error as e:
+        logging.warning(f"File cache disabled ({CACHE_PATH}): {e}")
+        try:
+            os.remove(CACHE_PATH) # A corrupt cache is rebuilt on the next run
+        except OSError:
+            pass
+        return None
+# TODO (Enhancement): Add a "Clear cache" button to the GUI.
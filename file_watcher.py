@@ -0,0 +1,171 @@
+# file_watcher.py
+# --- Imports Section ---
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import ctypes
+import ctypes.util
+from project_walker import walk_project
+# --- Constants Section ---
+DEFAULT_DEBOUNCE = 0.5 # Seconds of quiet after the last change before a rebuild starts
+DEFAULT_POLL_INTERVAL = 1.0 # Seconds between stat sweeps when inotify is unavailable
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len
+# --- Inotify Watcher Section ---
+class InotifyWatcher:
+    # Linux inotify through ctypes: one watch per non-pruned directory, added as new directories appear
+    def __init__(self, root_dir, dir_filter=None, follow_symlinks=False):
+        self.root_dir = root_dir
+        self.dir_filter = dir_filter
+        self.follow_symlinks = follow_symlinks
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {} # wd -> rel_dir
+        self.overflowed = False
+        self._watch_tree("")
+    def _add_watch(self, rel_dir):
+        abs_dir = os.path.join(self.root_dir, rel_dir) if rel_dir else self.root_dir
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(abs_dir), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            logging.debug(f"Cannot watch {abs_dir}: {os.strerror(err)}")
+            return
+        self.watches[wd] = rel_dir
+    def _watch_tree(self, rel_root):
+        abs_root = os.path.join(self.root_dir, rel_root) if rel_root else self.root_dir
+        prefix = rel_root + "/" if rel_root else ""
+        rel_dirs = []
+        def dir_filter(rel_dir):
+            return self.dir_filter is None or self.dir_filter(prefix + rel_dir)
+        walk_project(abs_root, dir_filter=dir_filter, follow_symlinks=self.follow_symlinks, on_dir=lambda rel_dir, _: rel_dirs.append(prefix + rel_dir if rel_dir else rel_root))
+        for rel_dir in sorted(rel_dirs):
+            self._add_watch(rel_dir)
+    def wait(self, timeout=None):
+        # Returns the set of changed relative paths; empty on timeout
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, pos)
+                pos += EVENT_HEADER.size
+                name = os.fsdecode(data[pos:pos + name_len].rstrip(b"\0"))
+                pos += name_len
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    changed.add("")
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                rel_dir = self.watches.get(wd)
+                if rel_dir is None:
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir and name else (name or rel_dir)
+                changed.add(rel_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and (self.dir_filter is None or self.dir_filter(rel_path)):
+                    self._watch_tree(rel_path)
+        return changed
+    def close(self):
+        os.close(self.fd)
+# --- Polling Watcher Section ---
+class PollingWatcher:
+    # Portable fallback: compares (size, mtime_ns) of every file in the non-pruned tree on each sweep
+    def __init__(self, root_dir, dir_filter=None, poll_interval=DEFAULT_POLL_INTERVAL, follow_symlinks=False):
+        self.root_dir = root_dir
+        self.dir_filter = dir_filter
+        self.follow_symlinks = follow_symlinks
+        self.poll_interval = poll_interval
+        self.snapshot = self._scan()
+    def _scan(self):
+        snapshot = {}
+        for rel_path, entry in walk_project(self.root_dir, dir_filter=self.dir_filter, follow_symlinks=self.follow_symlinks, dedup_files=False):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            snapshot[rel_path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.poll_interval if deadline is None else min(self.poll_interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            current = self._scan()
+            changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+    def close(self):
+        pass
+def create_watcher(root_dir, dir_filter=None, poll_interval=DEFAULT_POLL_INTERVAL, follow_symlinks=False):
+    if sys.platform.startswith("linux"):
+        try:
+            watcher = InotifyWatcher(root_dir, dir_filter, follow_symlinks)
+            logging.info(f"Watching {len(watcher.watches)} directories with inotify")
+            return watcher
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify unavailable ({e}), falling back to polling")
+    logging.info(f"Watching {root_dir} by polling every {poll_interval}s")
+    return PollingWatcher(root_dir, dir_filter, poll_interval, follow_symlinks)
+# --- Watch Loop Section ---
+def watch_project(root_dir, rebuild, dir_filter=None, is_relevant=None, debounce=DEFAULT_DEBOUNCE, poll_interval=DEFAULT_POLL_INTERVAL, follow_symlinks=False):
+    # Calls rebuild(changed_paths) once changes have been quiet for `debounce` seconds; runs until Ctrl+C
+    watcher = create_watcher(root_dir, dir_filter, poll_interval, follow_symlinks)
+    def wait(timeout=None):
+        nonlocal watcher
+        try:
+            return watcher.wait(timeout)
+        except OSError as e:
+            if e.errno != errno.ENOSPC:
+                raise
+            # A new directory tree used up the inotify watches: poll from here on, as when the limit is hit at startup
+            logging.warning(f"{e.strerror}, falling back to polling")
+            watcher.close()
+            watcher = PollingWatcher(root_dir, dir_filter, poll_interval, follow_symlinks)
+            return {""} # Events may have been lost; treated like a queue overflow
+    try:
+        while True:
+            changed = wait()
+            while changed:
+                more = wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if is_relevant is not None:
+                changed = {p for p in changed if is_relevant(p)}
+            if changed:
+                rebuild(changed)
+    except KeyboardInterrupt:
+        logging.info("Watch mode stopped", extra={"console": True})
+    finally:
+        watcher.close()
+# TODO (Enhancement): Use ReadDirectoryChangesW on Windows and FSEvents on macOS instead of polling.
@@ -0,0 +1,214 @@
+# file_worker.py
+# Per-file work that core_dump may hand to worker processes. Importing this module has no side effects, so worker
+# processes never load dump-config.json, open a log file or start the minifier service.
+# --- Imports Section ---
+import time
+import bisect
+import logging
+from itertools import accumulate
+from token_estimator import CharacterCounter, create_estimator
+from minifier_registry import call_backend
+# --- Constants Section ---
+EXOTIC_LINE_BREAKS = "\r\v\f\x1c\x1d\x1e\x85\u2028\u2029" # Line breaks str.splitlines() knows besides "\n"
+# --- Logging Section ---
+def log_write(message):
+    # Per-file / per-item detail; only recorded at DEBUG level
+    logging.debug(message)
+def log_message(message):
+    # Run-level message, shown on the console and written to the log
+    logging.info(message, extra={"console": True})
+# --- Splitting Section ---
+def create_section_header(relative_path, is_first_part, split_part_num, format_out):
+    if is_first_part:
+        return f"## {relative_path}\n\n"
+    else:
+        return f"## Continuation of {relative_path} (Part {split_part_num})\n\n"
+def _line_cuts(content, effective_max, chunk_size, relative_path):
+    # Cut points (start, end, has_continuation) for sections of whole lines of at most effective_max characters; a
+    # line longer than that is cut into chunk_size pieces. Cut points are found from line offsets (rfind on "\n", or
+    # bisect over str.splitlines() offsets when other line breaks occur), so the work grows linearly with the size.
+    cuts = []
+    total = len(content)
+    if any(line_break in content for line_break in EXOTIC_LINE_BREAKS):
+        line_ends = list(accumulate(map(len, content.splitlines(keepends=True))))
+        def next_line_end(pos):
+            return line_ends[bisect.bisect_right(line_ends, pos)]
+        def last_line_end(lo, limit):
+            return line_ends[bisect.bisect_right(line_ends, limit) - 1]
+    else:
+        def next_line_end(pos):
+            return content.find("\n", pos) + 1 or total
+        def last_line_end(lo, limit):
+            return total if limit >= total else content.rfind("\n", lo, limit) + 1
+    start = pos = 0
+    while pos < total:
+        line_end = next_line_end(pos)
+        more_lines = line_end < total
+        if line_end - pos > effective_max:
+            log_write(f"Warning: Line too long in {relative_path} at offset {pos} (size: {line_end - pos} > {effective_max}), force chunking")
+            while pos < line_end:
+                end_pos = min(pos + chunk_size, line_end)
+                if end_pos - start > effective_max and pos > start:
+                    has_more = end_pos < line_end or more_lines
+                    cuts.append((start, pos, has_more))
+                    start = pos
+                pos = end_pos
+            continue
+        if line_end - start > effective_max and pos > start:
+            cuts.append((start, pos, more_lines))
+            start = pos
+        # Every following line that still fits joins the section in one step
+        pos = max(line_end, last_line_end(pos, start + effective_max))
+    cuts.append((start, total, False))
+    return cuts
+def _token_cuts(content, effective_max, chunk_size, relative_path, estimator):
+    # _line_cuts for budgets in tokens: the budgets become characters at the file's average characters per token, and
+    # a section that still comes out over budget (text denser than the average) is cut again at its own density.
+    # Every section but the last continues; a re-cut slice cannot tell that from its own lines.
+    cuts = []
+    def cut(lo, hi, chars_per_token):
+        text = content[lo:hi]
+        pieces = _line_cuts(text, max(1, int(effective_max * chars_per_token)), max(1, int(chunk_size * chars_per_token)), relative_path)
+        for start, end, _ in pieces:
+            size = estimator.count(text[start:end])
+            if size > effective_max and end - start > 1:
+                cut(lo + start, lo + end, (end - start) / size)
+            else:
+                cuts.append((lo + start, lo + end, lo + end < len(content)))
+    cut(0, len(content), len(content) / max(1, estimator.count(content)))
+    return cuts
+def split_large_file(content, relative_path, max_section_size, format_out, lang, include_hashes=False, file_hash=None, split_part_num=1, is_minify_mode=False, estimator=None):
+    # Cuts content into sections of whole lines (see _line_cuts); each section is a single slice of content. Sizes are
+    # in the estimator's unit, characters by default.
+    estimator = estimator or CharacterCounter()
+    sections = []
+    effective_max = max_section_size - estimator.allowance(500) # Conservative allowance for header and overhead
+    chunk_size = effective_max - estimator.allowance(200)
+    fence = f"``` {lang}\n" if lang else "```\n"
+    code_end = "\n```\n\n"
+    log_write(f"Splitting file {relative_path} into sections (max size: {max_section_size} {estimator.unit}, minifyMode: {is_minify_mode})")
+    def add(start, end, has_continuation):
+        # Slices content[start:end] into the next section; has_continuation also adds the placeholder line
+        nonlocal split_part_num
+        is_first_part = not sections
+        hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash and is_first_part else ""
+        h = create_section_header(relative_path + hash_str, is_first_part, split_part_num, format_out)
+        full_section = "".join((h, fence, content[start:end], "# [CONTINUATION_PLACEHOLDER]\n" if has_continuation else "", code_end))
+        sections.append({
+            "RelativePath": relative_path if is_first_part else f"Continuation of {relative_path} (Part {split_part_num})",
+            "FileSection": full_section,
+            "Length": estimator.count(full_section),
+            "OriginalPath": relative_path,
+            "SectionIndex": split_part_num,
+            "HasContinuation": has_continuation
+        })
+        split_part_num += 1
+    if not content:
+        log_write(f"Warning: Empty content for {relative_path}, creating single empty section")
+        add(0, 0, False)
+        return sections
+    if estimator.unit == "chars":
+        cuts = _line_cuts(content, effective_max, chunk_size, relative_path)
+    else:
+        cuts = _token_cuts(content, effective_max, chunk_size, relative_path, estimator)
+    for start, end, has_continuation in cuts:
+        add(start, end, has_continuation)
+    log_write(f"Completed splitting {relative_path} into {len(sections)} sections")
+    return sections
+# --- File Items Section ---
+def build_text_items(content, relative_path, file_hash, original_size, lang, include_hashes, ignore_size_limits, use_placeholders, split_large_files, single_file_limit, max_part_size, format_out, minify_mode, estimator):
+    # Sections of one text file: the whole file, a placeholder, or split_large_file's sections when it is over
+    # single_file_limit. Returns [] for a file that does not fit in a part and cannot be split.
+    file_items = []
+    hash_str = f" SHA256: {file_hash}" if include_hashes and file_hash else ""
+    header = f"## {relative_path}{hash_str}\n"
+    lang_str = lang if lang else ""
+    section_header = header + f"``` {lang_str}\n" if lang_str else header + f"```\n"
+    code_end = "\n```\n\n"
+    file_section = section_header + content + code_end
+    section_length = estimator.count(file_section)
+    if not ignore_size_limits:
+        if use_placeholders and section_length > single_file_limit:
+            placeholder_section = header + f"Large file ({original_size} characters). Content omitted to optimize for AI context.\n\n"
+            section_length = estimator.count(placeholder_section)
+            file_items.append({
+                "RelativePath": relative_path,
+                "FileSection": placeholder_section,
+                "Length": section_length,
+                "OriginalPath": relative_path,
+                "SectionIndex": 1,
+                "HasContinuation": False
+            })
+            log_write(f"Added placeholder for large file {relative_path} (size: {original_size})")
+        elif split_large_files and section_length > single_file_limit:
+            log_write(f"Splitting large file {relative_path} (size: {section_length})")
+            split_sections = split_large_file(content, relative_path, single_file_limit, format_out, lang, include_hashes, file_hash, 1, minify_mode, estimator)
+            for sec in split_sections:
+                log_write(f"Added split section {sec['RelativePath']} (size: {sec['Length']})")
+            file_items.extend(split_sections)
+        else:
+            if section_length > max_part_size:
+                log_message(f"Warning: File {relative_path} exceeds max part size ({section_length} > {max_part_size}), skipping")
+                return []
+            file_items.append({
+                "RelativePath": relative_path,
+                "FileSection": file_section,
+                "Length": section_length,
+                "OriginalPath": relative_path,
+                "SectionIndex": 1,
+                "HasContinuation": False
+            })
+            log_write(f"Added non-split file {relative_path} (size: {section_length})")
+    else:
+        file_items.append({
+            "RelativePath": relative_path,
+            "FileSection": file_section,
+            "Length": section_length,
+            "OriginalPath": relative_path,
+            "SectionIndex": 1,
+            "HasContinuation": False
+        })
+        log_write(f"Added full file {relative_path} (size: {section_length}) ignoring size limits")
+    return file_items
+# --- Worker Process Section ---
+_estimator = None # Set by init_worker in each worker process
+_collected = None # Log records of the task running in this worker process, returned to the parent to be logged
+class _CollectHandler(logging.Handler):
+    def emit(self, record):
+        if _collected is not None:
+            _collected.append((record.levelno, record.getMessage(), getattr(record, "console", False)))
+def init_worker(config, size_unit, log_level):
+    # Worker process initializer. Log records go back to the parent with each result instead of to the handlers
+    # inherited from it (a forked copy of its logging queue may be unusable).
+    global _estimator
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_CollectHandler())
+    root.setLevel(log_level)
+    _estimator = create_estimator(config, size_unit)
+def start_worker(_):
+    # No-op task; mapping it over the pool starts every worker process up front
+    return None
+def process_text(backends, content, build):
+    # CPU-bound part of the per-file stage, run in a worker process: the in-process minifiers [(name, func, options)]
+    # tried in order until one returns text, then build_text_items with the keyword arguments in build.
+    # Returns (minified text or None, name of the backend that produced it, [(name, chars in, chars out or None,
+    # seconds)] per backend tried, file items, [(level, message, console)] logged meanwhile).
+    global _collected
+    _collected = []
+    try:
+        stats = []
+        backend_name = None
+        for name, func, options in backends:
+            start = time.perf_counter()
+            minified = call_backend(name, func, options, content)
+            stats.append((name, len(content), None if minified is None else len(minified), time.perf_counter() - start))
+            if minified is not None:
+                content, backend_name = minified, name
+                break
+        items = build_text_items(content, estimator=_estimator, **build)
+        return content if backend_name else None, backend_name, stats, items, _collected
+    finally:
+        _collected = None
+# TODO (Enhancement): Send small files to the worker processes in batches to cut per-task pickling overhead.
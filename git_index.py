@@ -0,0 +1,123 @@
+# git_index.py
+# --- Imports Section ---
+import os
+import re
+import struct
+import logging
+# --- Constants Section ---
+GITLINK_MODE = 0o160000 # submodule commit entries
+DIR_MODE = 0o040000 # sparse-index directory entries
+FLAG_EXTENDED = 0x4000
+EXT_FLAG_SKIP_WORKTREE = 0x4000
+# --- Repository Discovery Section ---
+def find_git_dir(start_dir):
+    # Returns (work_tree_root, git_dir) for the repository containing start_dir, or (None, None)
+    current = os.path.abspath(start_dir)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return current, dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules use a "gitdir: <path>" file
+            try:
+                with open(dot_git, "r", encoding="utf-8") as f:
+                    line = f.readline().strip()
+                if line.startswith("gitdir:"):
+                    git_dir = line[len("gitdir:"):].strip()
+                    return current, os.path.normpath(os.path.join(current, git_dir))
+            except OSError as e:
+                logging.warning(f"Cannot read {dot_git}: {e}")
+            return None, None
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None, None
+        current = parent
+def _read_config(git_dir):
+    # Text of the repository's config file (shared by all worktrees), or "" when it cannot be read
+    config_dir = git_dir
+    commondir_path = os.path.join(git_dir, "commondir")
+    try:
+        if os.path.isfile(commondir_path):
+            with open(commondir_path, "r", encoding="utf-8") as f:
+                config_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        with open(os.path.join(config_dir, "config"), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+def _hash_size(git_dir):
+    if re.search(r'^\s*objectformat\s*=\s*sha256\s*$', _read_config(git_dir), re.MULTILINE | re.IGNORECASE):
+        return 32
+    return 20
+def ignore_case(start_dir):
+    # The repository's core.ignorecase (set by git on case-insensitive file systems); False outside a git checkout
+    work_tree, git_dir = find_git_dir(start_dir)
+    if work_tree is None:
+        return False
+    return re.search(r'^\s*ignorecase\s*=\s*(?:true|yes|on|1)\s*$', _read_config(git_dir), re.MULTILINE | re.IGNORECASE) is not None
+# --- Index Parsing Section ---
+def _read_varint(data, pos):
+    # Git's offset encoding used by index v4 path prefix compression
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+def read_git_index(git_dir):
+    # Parses .git/index (versions 2-4) and returns the tracked paths ('/'-separated, relative to the work tree)
+    with open(os.path.join(git_dir, "index"), "rb") as f:
+        data = f.read()
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise ValueError("Not a git index file")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise ValueError(f"Unsupported git index version {version}")
+    hash_size = _hash_size(git_dir)
+    fixed_size = 40 + hash_size + 2
+    paths = []
+    seen = set()
+    pos = 12
+    previous_name = b""
+    for _ in range(count):
+        entry_start = pos
+        mode = struct.unpack_from(">I", data, pos + 24)[0]
+        flags = struct.unpack_from(">H", data, pos + 40 + hash_size)[0]
+        pos += fixed_size
+        extended_flags = 0
+        if version >= 3 and flags & FLAG_EXTENDED:
+            extended_flags = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous_name[:len(previous_name) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            name_len = flags & 0xFFF
+            if name_len == 0xFFF:
+                name_len = data.index(b"\0", pos) - pos
+            name = data[pos:pos + name_len]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            pos = entry_start + ((pos - entry_start + name_len + 8) & ~7)
+        previous_name = name
+        if mode == GITLINK_MODE or mode & 0o170000 == DIR_MODE or extended_flags & EXT_FLAG_SKIP_WORKTREE:
+            continue
+        if name in seen: # conflicted files have one entry per stage
+            continue
+        seen.add(name)
+        paths.append(name.decode("utf-8", "surrogateescape"))
+    return paths
+def tracked_files(start_dir):
+    # Tracked paths under start_dir, relative to start_dir; None when start_dir is not inside a git checkout
+    work_tree, git_dir = find_git_dir(start_dir)
+    if work_tree is None or not os.path.isfile(os.path.join(git_dir, "index")):
+        return None
+    paths = read_git_index(git_dir)
+    prefix = os.path.relpath(os.path.abspath(start_dir), work_tree).replace("\\", "/")
+    if prefix == ".":
+        return paths
+    prefix += "/"
+    return [p[len(prefix):] for p in paths if p.startswith(prefix)]
+# TODO (Enhancement): Read the untracked cache (UNTR extension) to avoid walking for --include-untracked.
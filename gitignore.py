@@ -0,0 +1,172 @@
+# gitignore.py
+# --- Imports Section ---
+import os
+import re
+import logging
+from git_index import ignore_case as git_ignore_case
+# --- Pattern Translation Section ---
+def gitignore_to_regex(pattern):
+    # Translates one gitignore glob (already stripped of '!', leading '/' and trailing '/') into a regex body
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == n or pattern[i + 2] == '/'
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append('.*') # "foo/**" -> everything inside foo
+                        i += 2
+                    else:
+                        out.append('(?:.*/)?') # "**/" and "/**/" -> zero or more directories
+                        i += 3
+                    continue
+                while i < n and pattern[i] == '*':
+                    i += 1
+                out.append('[^/]*')
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith('[!', i) or pattern.startswith('[^', i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+# --- Rule Set Section ---
+class GitignoreRules:
+    # Compiled rules of a single .gitignore file. Files without negations are reduced to set lookups and two
+    # combined regexes; files with negations keep per-rule regexes and are evaluated last-match-wins. Matching is
+    # case-sensitive, as in git, unless ignore_case is set (core.ignorecase).
+    def __init__(self, lines, source="", ignore_case=False):
+        self.source = source
+        self.ignore_case = ignore_case
+        flags = re.IGNORECASE if ignore_case else 0
+        self.rules = [] # (negate, dir_only, anchored, regex body)
+        for raw in lines:
+            rule = self._parse_line(raw)
+            if rule:
+                self.rules.append(rule)
+        self.has_negation = any(rule[0] for rule in self.rules)
+        self.name_literals = {}
+        name_regexes = {False: [], True: []}
+        path_regexes = {False: [], True: []}
+        for negate, dir_only, anchored, body in self.rules:
+            if not anchored and re.fullmatch(r'(?:\\.|[^\\\[\](.*?])*', body):
+                # Plain names such as "node_modules" or ".env" are answered with a dict lookup
+                literal = re.sub(r'\\(.)', r'\1', body)
+                literal = literal.lower() if ignore_case else literal
+                self.name_literals[literal] = self.name_literals.get(literal, True) and dir_only
+                continue
+            (path_regexes if anchored else name_regexes)[dir_only].append(body)
+        self.compiled = [(negate, dir_only, anchored, re.compile(body + '$', flags)) for negate, dir_only, anchored, body in self.rules]
+        self.name_regex = {k: re.compile('|'.join(f'(?:{b})' for b in v) + '$', flags) if v else None for k, v in name_regexes.items()}
+        self.path_regex = {k: re.compile('|'.join(f'(?:{b})' for b in v) + '$', flags) if v else None for k, v in path_regexes.items()}
+    @staticmethod
+    def _parse_line(raw):
+        line = raw.rstrip('\r\n')
+        if not line or line.startswith('#'):
+            return None
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+        anchored = '/' in line
+        line = line.lstrip('/')
+        try:
+            body = gitignore_to_regex(line)
+            re.compile(body)
+        except re.error as e:
+            logging.warning(f"Ignoring invalid .gitignore pattern '{raw.strip()}': {e}")
+            return None
+        return (negate, dir_only, anchored, body)
+    @classmethod
+    def from_file(cls, path, ignore_case=False):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f.readlines(), path, ignore_case)
+        except OSError as e:
+            logging.error(f"Error parsing .gitignore {path}: {e}")
+            return None
+    def match(self, sub_path, name, is_dir):
+        # True = ignored, False = re-included by a negation, None = this file has no opinion
+        if not self.has_negation:
+            dir_only = self.name_literals.get(name.lower() if self.ignore_case else name)
+            if dir_only is not None and (is_dir or not dir_only):
+                return True
+            for dir_only in ((False, True) if is_dir else (False,)):
+                name_regex = self.name_regex[dir_only]
+                if name_regex is not None and name_regex.match(name):
+                    return True
+                path_regex = self.path_regex[dir_only]
+                if path_regex is not None and path_regex.match(sub_path):
+                    return True
+            return None
+        for negate, dir_only, anchored, regex in reversed(self.compiled):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(sub_path if anchored else name):
+                return not negate
+        return None
+# --- Engine Section ---
+class GitignoreEngine:
+    # Loads .gitignore files at every level on demand, compiles each once and caches it by directory.
+    # Deeper files take precedence over their parents, as in git. ignore_case defaults to the repository's
+    # core.ignorecase.
+    def __init__(self, root_dir, ignore_case=None):
+        self.root_dir = root_dir
+        self.ignore_case = git_ignore_case(root_dir) if ignore_case is None else ignore_case
+        self.cache = {}
+    def note_listing(self, rel_dir, file_names):
+        # Called by the walker with each directory's listing so directories without a .gitignore cost nothing
+        if rel_dir not in self.cache and '.gitignore' not in file_names:
+            self.cache[rel_dir] = None
+    def rules_for(self, rel_dir):
+        if rel_dir not in self.cache:
+            path = os.path.join(self.root_dir, rel_dir, '.gitignore') if rel_dir else os.path.join(self.root_dir, '.gitignore')
+            rules = GitignoreRules.from_file(path, self.ignore_case) if os.path.isfile(path) else None
+            self.cache[rel_dir] = rules if rules and rules.rules else None
+            if self.cache[rel_dir]:
+                logging.info(f"Loaded {len(rules.rules)} rules from {path}")
+        return self.cache[rel_dir]
+    def is_ignored(self, rel_path, is_dir=False):
+        rel_path = rel_path.replace('\\', '/')
+        slash = rel_path.rfind('/')
+        name = rel_path[slash + 1:]
+        if is_dir and name == '.git':
+            return True
+        while True:
+            base = rel_path[:slash] if slash != -1 else ""
+            rules = self.rules_for(base)
+            if rules is not None:
+                result = rules.match(rel_path[slash + 1:] if slash != -1 else rel_path, name, is_dir)
+                if result is not None:
+                    return result
+            if slash == -1:
+                return False
+            slash = rel_path.rfind('/', 0, slash)
+    def rule_count(self):
+        return sum(len(rules.rules) for rules in self.cache.values() if rules)
+# TODO (Enhancement): Honour .git/info/exclude and core.excludesFile.
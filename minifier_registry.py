@@ -0,0 +1,214 @@
+# minifier_registry.py
+# --- Imports Section ---
+import time
+import pickle
+import logging
+import importlib
+import threading
+from importlib import metadata
+from text_minifier import minify_js, minify_css, minify_html, minify_c_family, minify_python
+# --- Constants Section ---
+IN_PROCESS = "in-process" # Pure Python, bound by the GIL; extra threads only overlap file I/O
+EXTERNAL = "external" # Runs in another process, so threads waiting on it run in parallel
+ENTRY_POINT_GROUP = "dump_project.minifiers" # Each entry point is called with the registry and may add backends
+# Extension -> backends tried in order; the first one that returns text wins
+DEFAULT_CHAINS = {
+    ".js": ["terser", "builtin-js"], ".ts": ["terser", "builtin-js"], ".jsx": ["terser", "builtin-js"], ".tsx": ["terser", "builtin-js"],
+    ".css": ["cleancss", "builtin-css"],
+    ".html": ["html-minifier", "builtin-html"], ".htm": ["html-minifier", "builtin-html"],
+    ".py": ["builtin-python"], ".pyw": ["builtin-python"], ".pyi": ["builtin-python"],
+    ".c": ["builtin-c"], ".h": ["builtin-c"], ".cpp": ["builtin-c"], ".cc": ["builtin-c"], ".cxx": ["builtin-c"], ".hpp": ["builtin-c"],
+    ".hh": ["builtin-c"], ".hxx": ["builtin-c"], ".inl": ["builtin-c"], ".ipp": ["builtin-c"], ".tpp": ["builtin-c"],
+    ".java": ["builtin-java"], ".cs": ["builtin-csharp"], ".rs": ["builtin-rust"], ".go": ["builtin-go"], ".kt": ["builtin-kotlin"], ".kts": ["builtin-kotlin"],
+}
+# --- Backend Section ---
+class MinifierBackend:
+    # A named minifier. func(content) returns the minified text, or None to hand the file to the next backend in
+    # the chain. joins_lines marks output that may be a single long line, which the splitter cuts by size instead
+    # of by line. options are part of the dump's cache key, so changing them invalidates cached output; so is the
+    # version returned by version() (None for builtins), so upgrading an external tool does too.
+    def __init__(self, name, func, cost=IN_PROCESS, joins_lines=True, options=None, available=True, version=None):
+        if cost not in (IN_PROCESS, EXTERNAL):
+            raise ValueError(f"Unknown cost class for minifier {name}: {cost}")
+        self.name = name
+        self.func = func
+        self.cost = cost
+        self.joins_lines = joins_lines
+        self.options = dict(options or {})
+        self.available = available
+        self.version = version
+        self.portable = None # See is_portable()
+        self.lock = threading.Lock()
+        self.reset_stats()
+    def reset_stats(self):
+        with self.lock:
+            self.files = 0
+            self.declined = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.seconds = 0.0
+    def run(self, content):
+        start = time.perf_counter()
+        minified = call_backend(self.name, self.func, self.options, content)
+        self.record(len(content), None if minified is None else len(minified), time.perf_counter() - start)
+        return minified
+    def record(self, bytes_in, bytes_out, seconds):
+        # Adds one call to the statistics; bytes_out is None when the backend declined. Also used for calls that
+        # ran in a worker process.
+        with self.lock:
+            self.seconds += seconds
+            if bytes_out is None:
+                self.declined += 1
+            else:
+                self.files += 1
+                self.bytes_in += bytes_in
+                self.bytes_out += bytes_out
+    def is_portable(self):
+        # In-process backends can also run in a worker process when their function and options pickle, which
+        # module-level functions do and lambdas or closures do not
+        if self.portable is None:
+            try:
+                pickle.dumps((self.func, self.options))
+                self.portable = self.cost == IN_PROCESS
+            except Exception:
+                self.portable = False
+        return self.portable
+    def report(self):
+        with self.lock:
+            if not self.files and not self.declined:
+                return None
+            saved = 100 * (self.bytes_in - self.bytes_out) / self.bytes_in if self.bytes_in else 0
+            declined = f", {self.declined} declined" if self.declined else ""
+            return (f"Minifier {self.name} ({self.cost}): {self.files} files{declined}, {self.bytes_in / 1024:.0f} KB -> {self.bytes_out / 1024:.0f} KB "
+                    f"({saved:.0f}% saved) in {self.seconds:.2f}s")
+def call_backend(name, func, options, content):
+    # A backend that raises (a plugin or "module:function" callable, typically) is logged and counts as having
+    # declined, so the file goes on to the next backend in the chain. Also used in worker processes.
+    try:
+        return func(content, **options)
+    except Exception as e:
+        logging.warning(f"Minifier {name} failed ({type(e).__name__}: {e}), trying the next one")
+        return None
+def load_callable(spec):
+    # "package.module:function" -> function; also loads token estimator plugins
+    module_name, _, attr = spec.partition(":")
+    target = importlib.import_module(module_name)
+    for part in attr.split("."):
+        target = getattr(target, part)
+    return target
+# --- Registry Section ---
+class MinifierRegistry:
+    def __init__(self):
+        self.backends = {}
+        self.chains = {}
+    def add_backend(self, backend):
+        self.backends[backend.name] = backend
+    def set_chain(self, ext, names):
+        self.chains[ext.lower()] = list(names)
+    def configure(self, chains):
+        # chains comes from the "Minifiers" key of dump-config.json: {".ext": ["backend", "module:function", ...]}.
+        # A "module:function" entry registers that function as an in-process backend; an empty list turns the
+        # extension off.
+        for ext, names in chains.items():
+            for name in names:
+                if name not in self.backends and ":" in name:
+                    try:
+                        self.add_backend(MinifierBackend(name, load_callable(name)))
+                    except (ImportError, AttributeError, ValueError) as e:
+                        logging.warning(f"Cannot load minifier {name} for {ext}: {e}")
+            self.set_chain(ext, names)
+    def load_entry_points(self, group=ENTRY_POINT_GROUP):
+        try:
+            entries = metadata.entry_points(group=group)
+        except TypeError: # Python < 3.10
+            entries = metadata.entry_points().get(group, [])
+        for entry in entries:
+            try:
+                entry.load()(self)
+                logging.info(f"Loaded minifier plugin {entry.name}")
+            except Exception as e:
+                logging.warning(f"Cannot load minifier plugin {entry.name}: {e}")
+    def chain(self, ext):
+        # Available backends for the extension, in order
+        chain = []
+        for name in self.chains.get(ext.lower(), ()):
+            backend = self.backends.get(name)
+            if backend is None:
+                logging.debug(f"Unknown minifier {name} for {ext}")
+            elif backend.available:
+                chain.append(backend)
+        return chain
+    def handles(self, ext):
+        return bool(self.chain(ext))
+    def joins_lines(self, ext):
+        return any(backend.joins_lines for backend in self.chain(ext))
+    def has_external(self, extensions=None):
+        exts = self.chains if extensions is None else extensions
+        return any(backend.cost == EXTERNAL for ext in exts for backend in self.chain(ext))
+    def split_chain(self, ext):
+        # (backends to run in this process, the portable in-process backends that end the chain), so the CPU-bound
+        # tail can go to a worker process once the external backends before it have declined
+        chain = self.chain(ext)
+        start = len(chain)
+        while start and chain[start - 1].is_portable():
+            start -= 1
+        return chain[:start], chain[start:]
+    def has_portable(self, extensions=None):
+        exts = self.chains if extensions is None else extensions
+        return any(self.split_chain(ext)[1] for ext in exts)
+    def minify(self, ext, content):
+        # Returns (text, name of the backend that produced it); the content is returned unchanged with None when
+        # no backend handles the extension or all of them declined
+        return self.run_chain(self.chain(ext), content)
+    def run_chain(self, backends, content):
+        for backend in backends:
+            minified = backend.run(content)
+            if minified is not None:
+                return minified, backend.name
+        return content, None
+    def signature(self):
+        # Identifies the effective configuration for cache keys and dump manifests
+        parts = []
+        for ext in sorted(self.chains):
+            names = []
+            for backend in self.chain(ext):
+                options = ",".join(f"{key}={value!r}" for key, value in sorted(backend.options.items()))
+                name = f"{backend.name}@{backend.version()}" if backend.version else backend.name
+                names.append(f"{name}({options})" if options else name)
+            parts.append(f"{ext}={'+'.join(names)}")
+        return ";".join(parts)
+    def finish_run(self):
+        # Logs what each backend did during this run and starts fresh statistics
+        for backend in self.backends.values():
+            line = backend.report()
+            if line:
+                logging.info(line, extra={"console": True})
+            backend.reset_stats()
+# --- Default Registry Section ---
+def create_registry(service, config):
+    # Built-in backends, external tools served by the MinifierService, entry point plugins, then the per-extension
+    # chains from DEFAULT_CHAINS overridden by the "Minifiers" config key
+    registry = MinifierRegistry()
+    for tool in ("terser", "cleancss", "html-minifier"):
+        registry.add_backend(MinifierBackend(tool, lambda content, tool=tool: service.minify(tool, content), cost=EXTERNAL, available=service.available(tool),
+                                             version=lambda tool=tool: service.tool_version(tool)))
+    registry.add_backend(MinifierBackend("builtin-js", minify_js))
+    registry.add_backend(MinifierBackend("builtin-css", minify_css))
+    registry.add_backend(MinifierBackend("builtin-html", minify_html))
+    registry.add_backend(MinifierBackend("builtin-c", minify_c_family, options={"line_splices": True}))
+    registry.add_backend(MinifierBackend("builtin-java", minify_c_family))
+    registry.add_backend(MinifierBackend("builtin-csharp", minify_c_family))
+    registry.add_backend(MinifierBackend("builtin-rust", minify_c_family, options={"nested_comments": True}))
+    registry.add_backend(MinifierBackend("builtin-go", minify_c_family, joins_lines=False, options={"newline_statements": True}))
+    registry.add_backend(MinifierBackend("builtin-kotlin", minify_c_family, joins_lines=False, options={"newline_statements": True, "nested_comments": True}))
+    registry.add_backend(MinifierBackend("builtin-python", minify_python, joins_lines=False, options={
+        "strip_comments": config.get("PythonStripComments", True),
+        "strip_docstrings": config.get("PythonStripDocstrings", True),
+        "indent": " " * int(config.get("PythonIndent", 1)),
+    }))
+    for ext, names in DEFAULT_CHAINS.items():
+        registry.set_chain(ext, names)
+    registry.load_entry_points()
+    registry.configure(config.get("Minifiers", {}))
+    return registry
+# TODO (Enhancement): Let backends minify a batch of files per call to amortise per-request overhead.
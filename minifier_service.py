@@ -0,0 +1,262 @@
+# minifier_service.py
+# --- Imports Section ---
+import os
+import json
+import queue
+import shutil
+import time
+import logging
+import threading
+import subprocess
+# --- Constants Section ---
+DEFAULT_TIMEOUT = 30 # Seconds per file before an external minifier is abandoned
+# CLI name -> (npm module loaded by the Node workers, arguments for the one-shot CLI fallback)
+TOOLS = {
+    "terser": ("terser", ["--compress", "--mangle"]),
+    "cleancss": ("clean-css", ["-O2"]),
+    "html-minifier": ("html-minifier", ["--collapse-whitespace", "--remove-comments"]),
+}
+# Long-lived worker: one JSON request per stdin line, one JSON reply per stdout line, answered in order
+NODE_WORKER_SCRIPT = r"""
+const readline = require("readline");
+const load = name => { try { return require(name); } catch (e) { return null; } };
+const tools = {};
+const terser = load("terser");
+const CleanCSS = load("clean-css");
+const htmlMinifier = load("html-minifier");
+if (terser) tools["terser"] = code => Promise.resolve(terser.minify(code, {compress: true, mangle: true})).then(r => { if (r.error) throw r.error; return r.code; });
+if (CleanCSS) tools["cleancss"] = code => { const r = new CleanCSS({level: 2}).minify(code); if (r.errors.length) throw new Error(r.errors.join("; ")); return r.styles; };
+if (htmlMinifier) tools["html-minifier"] = code => htmlMinifier.minify(code, {collapseWhitespace: true, removeComments: true});
+const send = msg => process.stdout.write(JSON.stringify(msg) + "\n");
+let chain = Promise.resolve();
+send({ready: Object.keys(tools)});
+readline.createInterface({input: process.stdin}).on("line", line => {
+    const req = JSON.parse(line);
+    chain = chain.then(async () => {
+        try { send({id: req.id, ok: true, code: await tools[req.tool](req.code)}); }
+        catch (e) { send({id: req.id, ok: false, error: String((e && e.message) || e)}); }
+    });
+});
+"""
+# --- Errors Section ---
+class MinifierError(Exception):
+    # The minifier rejected one file; the worker is still usable
+    pass
+class WorkerError(MinifierError):
+    # The worker timed out or died and has to be replaced
+    pass
+# --- Node Worker Section ---
+def _module_dirs(tool_paths):
+    # Globally installed CLIs live in <prefix>/lib/node_modules/<pkg>/bin (or <prefix>/node_modules on Windows);
+    # those directories go on NODE_PATH so the worker can require() the same packages
+    dirs = []
+    for path in tool_paths:
+        real = os.path.realpath(path)
+        parts = real.split(os.sep)
+        if "node_modules" in parts:
+            index = len(parts) - 1 - parts[::-1].index("node_modules")
+            candidate = os.sep.join(parts[:index + 1])
+        else:
+            candidate = os.path.join(os.path.dirname(path), "node_modules")
+        if os.path.isdir(candidate) and candidate not in dirs:
+            dirs.append(candidate)
+    return dirs
+class NodeWorker:
+    def __init__(self, node_path, module_dirs, timeout):
+        env = dict(os.environ)
+        env["NODE_PATH"] = os.pathsep.join(module_dirs + ([env["NODE_PATH"]] if env.get("NODE_PATH") else []))
+        self.proc = subprocess.Popen([node_path, "-e", NODE_WORKER_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                     env=env, text=True, encoding="utf-8")
+        self.replies = queue.Queue()
+        self.request_id = 0
+        threading.Thread(target=self._read_replies, daemon=True).start()
+        try:
+            self.tools = set(self._reply(timeout).get("ready", []))
+        except WorkerError:
+            self.close()
+            raise
+    def _read_replies(self):
+        # A reader thread lets replies be awaited with a timeout on every platform (select() cannot wait on pipes on Windows)
+        for line in self.proc.stdout:
+            self.replies.put(line)
+        self.replies.put(None)
+    def _reply(self, timeout):
+        try:
+            line = self.replies.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError(f"no reply within {timeout}s")
+        if line is None:
+            raise WorkerError("worker exited")
+        return json.loads(line)
+    def minify(self, tool, code, timeout):
+        self.request_id += 1
+        try:
+            self.proc.stdin.write(json.dumps({"id": self.request_id, "tool": tool, "code": code}) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            raise WorkerError(f"cannot send to worker: {e}")
+        reply = self._reply(timeout)
+        if reply.get("id") != self.request_id:
+            raise WorkerError("worker replies out of sync")
+        if not reply.get("ok"):
+            raise MinifierError(reply.get("error", "unknown error"))
+        return reply["code"]
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+# --- Service Section ---
+class MinifierService:
+    # Finds the external minifiers once and keeps up to max_workers Node processes alive to serve them, so each
+    # file costs one pipe round trip instead of a Node startup. Without Node (or when a package cannot be loaded)
+    # the CLI is run per file. minify() returns None whenever the caller should use its built-in minifier.
+    def __init__(self, max_workers=1, timeout=DEFAULT_TIMEOUT, cache=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache # Optional MinifyCache consulted before any worker or CLI is used
+        self.versions = {}
+        self.tool_paths = {name: shutil.which(name) for name in TOOLS}
+        self.node_path = shutil.which("node") if any(self.tool_paths.values()) else None
+        self.module_dirs = _module_dirs([p for p in self.tool_paths.values() if p])
+        self.worker_tools = None # Set once the first worker reports which packages it could load
+        self.idle = queue.LifoQueue()
+        self.worker_count = 0
+        self.lock = threading.Lock()
+        self.all_workers = []
+    def available(self, tool):
+        return self.tool_paths.get(tool) is not None
+    def _acquire(self):
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                return worker
+        with self.lock:
+            start_new = self.node_path is not None and self.worker_count < self.max_workers
+            if start_new:
+                self.worker_count += 1
+            elif self.worker_count == 0:
+                return None
+        if not start_new:
+            # All workers are busy; None is a wake-up left by _discard so the waiter can start a replacement
+            worker = self.idle.get()
+            return worker if worker is not None else self._acquire()
+        try:
+            worker = NodeWorker(self.node_path, self.module_dirs, self.timeout)
+        except (OSError, WorkerError) as e:
+            logging.warning(f"Cannot start Node minifier worker ({e}), running minifiers per file")
+            with self.lock:
+                self.worker_count -= 1
+                self.node_path = None
+            self.idle.put(None)
+            return None
+        with self.lock:
+            self.all_workers.append(worker)
+            if self.worker_tools is None:
+                self.worker_tools = worker.tools
+                logging.info(f"Node minifier workers serve: {', '.join(sorted(worker.tools)) or 'nothing'}")
+        return worker
+    def _discard(self, worker):
+        worker.close()
+        with self.lock:
+            self.worker_count -= 1
+            if worker in self.all_workers:
+                self.all_workers.remove(worker)
+        self.idle.put(None)
+    def tool_version(self, tool):
+        # Read from the package's package.json next to the resolved CLI; falls back to "<tool> --version" once
+        with self.lock:
+            if tool in self.versions:
+                return self.versions[tool]
+        version = None
+        path = self.tool_paths.get(tool)
+        current = os.path.dirname(os.path.realpath(path))
+        while version is None:
+            package_json = os.path.join(current, "package.json")
+            if os.path.isfile(package_json):
+                try:
+                    with open(package_json, "r", encoding="utf-8") as f:
+                        package = json.load(f)
+                    if package.get("name") == TOOLS[tool][0] or package.get("name") == tool:
+                        version = package.get("version")
+                except (OSError, ValueError):
+                    pass
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        if version is None:
+            try:
+                version = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=self.timeout).stdout.strip() or "unknown"
+            except Exception:
+                version = "unknown"
+        with self.lock:
+            self.versions[tool] = version
+        return version
+    def minify(self, tool, code):
+        path = self.tool_paths.get(tool)
+        if path is None:
+            return None
+        if self.cache is None:
+            return self._minify_uncached(tool, path, code)
+        key = self.cache.key(tool, self.tool_version(tool), " ".join(TOOLS[tool][1]), code)
+        minified = self.cache.get(key)
+        if minified is not None:
+            return minified
+        start = time.perf_counter()
+        minified = self._minify_uncached(tool, path, code)
+        if minified is not None:
+            self.cache.put(key, minified, (time.perf_counter() - start) * 1000)
+        return minified
+    def _minify_uncached(self, tool, path, code):
+        if self.node_path is not None and (self.worker_tools is None or tool in self.worker_tools):
+            worker = self._acquire()
+            if worker is not None:
+                if tool in worker.tools:
+                    try:
+                        result = worker.minify(tool, code, self.timeout)
+                        self.idle.put(worker)
+                        return result
+                    except WorkerError as e:
+                        self._discard(worker)
+                        logging.debug(f"External minifier failed for {tool}: {e}, falling back to simple minify")
+                        return None
+                    except MinifierError as e:
+                        self.idle.put(worker)
+                        logging.debug(f"External minifier failed for {tool}: {e}, falling back to simple minify")
+                        return None
+                self.idle.put(worker)
+        return self._run_cli(tool, path, code)
+    def _run_cli(self, tool, path, code):
+        try:
+            result = subprocess.run([path] + TOOLS[tool][1], input=code.encode(), capture_output=True, check=True, timeout=self.timeout)
+            return result.stdout.decode()
+        except Exception as e:
+            logging.debug(f"External minifier failed for {tool}: {e}, falling back to simple minify")
+            return None
+    def finish_run(self):
+        # Logs this run's cache statistics and trims the cache
+        if self.cache is None:
+            return
+        report = self.cache.report()
+        if report:
+            logging.info(report, extra={"console": True})
+        removed = self.cache.evict()
+        if removed:
+            logging.info(f"Evicted {removed} minify cache entries")
+        self.cache.reset_stats()
+    def close(self):
+        with self.lock:
+            workers, self.all_workers = self.all_workers, []
+            self.worker_count = 0
+        for worker in workers:
+            worker.close()
+        self.idle = queue.LifoQueue()
+# TODO (Enhancement): Support html-minifier-terser and esbuild as alternative backends.
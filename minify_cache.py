@@ -0,0 +1,91 @@
+# minify_cache.py
+# --- Imports Section ---
+import os
+import hashlib
+import logging
+import threading
+from pathlib import Path
+# --- Constants Section ---
+CACHE_DIR = Path(__file__).parent / "minify-cache"
+DEFAULT_MAX_MB = 512
+# --- Cache Section ---
+class MinifyCache:
+    # Content-addressed store of external minifier output: the key is sha256 over the minifier name, version, flags
+    # and the source text, so identical files share one entry across projects and branches. Each entry is a file
+    # "<elapsed ms>\n<minified text>"; its mtime is bumped on every hit and drives LRU eviction.
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.reset_stats()
+    def reset_stats(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.saved_ms = 0
+    @staticmethod
+    def key(tool, version, flags, content):
+        digest = hashlib.sha256()
+        for part in (tool, version, flags):
+            digest.update(part.encode("utf-8") + b"\0")
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+    def _path(self, key):
+        return self.cache_dir / key[:2] / key
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                elapsed_ms, _, minified = f.read().partition("\n")
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+            self.saved_ms += int(elapsed_ms) if elapsed_ms.isdigit() else 0
+        return minified
+    def put(self, key, minified, elapsed_ms):
+        path = self._path(key)
+        tmp_path = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                f.write(f"{int(elapsed_ms)}\n{minified}")
+            os.replace(tmp_path, path) # Atomic, so concurrent dumps never read a half-written entry
+        except OSError as e:
+            logging.debug(f"Cannot write minify cache entry {path}: {e}")
+    def evict(self):
+        # Removes least recently used entries until the cache fits in max_bytes; returns the number removed
+        entries = []
+        total = 0
+        try:
+            for sub in os.scandir(self.cache_dir):
+                if not sub.is_dir():
+                    continue
+                for entry in os.scandir(sub.path):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return 0
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        return removed
+    def report(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            if not lookups:
+                return None
+            return f"Minify cache: {self.hits}/{lookups} hits ({100 * self.hits / lookups:.0f}%), saved ~{self.saved_ms / 1000:.1f}s of minifier time"
+# TODO (Enhancement): Share the cache directory between machines (e.g. on a network drive) with a configurable path.
@@ -0,0 +1,185 @@
+# part_packer.py
+# --- Imports Section ---
+import math
+import heapq
+import bisect
+from itertools import groupby
+# --- Fixed Part Count Section ---
+def partition_parts(items, part_count, base_length=0, first_part_extra=0, previous_parts=None, size_key="EffectiveLength", max_moves=1000):
+    # Splits the items over exactly part_count parts, keeping the largest part as small as possible. Every part
+    # starts at base_length and part 1 also holds first_part_extra. Items are first dealt out largest first, each to
+    # the least full part (LPT; the lowest numbered part wins ties), or to the part they were in last time
+    # (previous_parts: {RelativePath: part number}), where they then stay. Local search then moves one item, or
+    # swaps two, between the largest part and another part whenever that makes the larger of the two smaller, until
+    # the largest part reaches the lower bound, no move helps or max_moves is used up.
+    # Returns ([(size, items)] for part 1, 2, ..., lower bound on the size of the largest part).
+    loads = [base_length + (first_part_extra if i == 0 else 0) for i in range(part_count)]
+    ordered = sorted(items, key=lambda x: x[size_key], reverse=True)
+    sizes = [item[size_key] for item in ordered]
+    lower_bound = max(-(-(sum(loads) + sum(sizes)) // part_count), base_length + (sizes[0] if sizes else 0), max(loads))
+    pinned = [[] for _ in range(part_count)]
+    movable = [[] for _ in range(part_count)] # (size, index into ordered), kept sorted
+    heap = [(load, i) for i, load in enumerate(loads)]
+    heapq.heapify(heap)
+    previous_parts = previous_parts or {}
+    for seq, item in enumerate(ordered):
+        previous_part = previous_parts.get(item["RelativePath"], 0)
+        if 0 < previous_part <= part_count:
+            index = previous_part - 1
+            pinned[index].append(seq)
+        else:
+            while True:
+                load, index = heapq.heappop(heap)
+                if load == loads[index]:
+                    break
+            movable[index].append((sizes[seq], seq))
+        loads[index] += sizes[seq]
+        heapq.heappush(heap, (loads[index], index))
+    for part in movable:
+        part.sort()
+    for _ in range(max_moves):
+        a = max(range(part_count), key=loads.__getitem__)
+        if loads[a] <= lower_bound:
+            break
+        best = None # (larger of the two new loads, other part, item taken from a, item given back or None)
+        for swaps in (False, True): # Swaps cost a pass over the other parts' items, so they are tried only when no move helps
+            for b in range(part_count):
+                diff = loads[a] - loads[b]
+                if b == a or diff <= 1 or not movable[a]:
+                    continue
+                # Moving or swapping a net amount d gives max(loads[a] - d, loads[b] + d): best when d is near diff / 2
+                if swaps:
+                    candidates = [(taken, given) for given in movable[b] for taken in _closest(movable[a], given[0] + diff / 2)]
+                else:
+                    candidates = [(taken, None) for taken in _closest(movable[a], diff / 2)]
+                for taken, given in candidates:
+                    d = taken[0] - (given[0] if given else 0)
+                    if 0 < d < diff:
+                        pair_max = max(loads[a] - d, loads[b] + d)
+                        if best is None or pair_max < best[0]:
+                            best = (pair_max, b, taken, given)
+            if best is not None:
+                break
+        if best is None:
+            break
+        _, b, taken, given = best
+        movable[a].remove(taken)
+        bisect.insort(movable[b], taken)
+        loads[a] -= taken[0]
+        loads[b] += taken[0]
+        if given:
+            movable[b].remove(given)
+            bisect.insort(movable[a], given)
+            loads[b] -= given[0]
+            loads[a] += given[0]
+    parts = []
+    for i in range(part_count):
+        members = sorted(pinned[i] + [seq for _, seq in movable[i]])
+        parts.append((loads[i], [ordered[seq] for seq in members]))
+    return parts, lower_bound
+def _closest(entries, target):
+    # The entries of a sorted (size, seq) list just below and at or above target
+    position = bisect.bisect_left(entries, (target, -1))
+    return entries[max(0, position - 1):position + 1]
+# --- Size Limited Section ---
+def pack_best_fit(items, max_part_size, base_length, first_part_extra=0, previous_parts=None, size_key="EffectiveLength"):
+    # Best-Fit Decreasing: largest items first, each into the part with the least room that still holds it, else into
+    # a new part. Every part starts at base_length and may grow to max_part_size; part 1 also holds first_part_extra
+    # (the project tree). With previous_parts ({RelativePath: part number}) an item first goes back to the part it
+    # was in last time if it fits there, so unchanged parts keep their content. Free room is kept as a sorted list
+    # of (room, part index), so finding a part is a bisect and the part lists are only appended to. Parts that were
+    # only opened to keep an earlier part number and got nothing are dropped, and the parts after them move down.
+    # Returns [(size, items)] for part 1, 2, ...; an item larger than a part gets a part of its own.
+    loads = []
+    members = []
+    def limit(index):
+        return max_part_size - (first_part_extra if index == 0 else 0)
+    def new_part():
+        loads.append(base_length + (first_part_extra if not loads else 0))
+        members.append([])
+    rooms = []
+    unplaced = sorted(items, key=lambda x: x[size_key], reverse=True)
+    if previous_parts:
+        remaining = []
+        for item in unplaced:
+            previous_part = previous_parts.get(item["RelativePath"])
+            if previous_part is None:
+                remaining.append(item)
+                continue
+            while len(loads) < previous_part:
+                new_part()
+            index = previous_part - 1
+            if loads[index] + item[size_key] <= limit(index):
+                loads[index] += item[size_key]
+                members[index].append(item)
+            else:
+                remaining.append(item)
+        unplaced = remaining
+        rooms = sorted((limit(i) - loads[i], i) for i in range(len(loads)))
+    for item in unplaced:
+        size = item[size_key]
+        position = bisect.bisect_left(rooms, (size, -1))
+        if position < len(rooms):
+            room, index = rooms.pop(position)
+            loads[index] += size
+            members[index].append(item)
+            bisect.insort(rooms, (room - size, index))
+        else:
+            new_part()
+            index = len(loads) - 1
+            loads[index] += size
+            members[index].append(item)
+            bisect.insort(rooms, (limit(index) - loads[index], index))
+    kept = [i for i in range(len(members)) if members[i]]
+    if kept and kept[0] != 0:
+        # The part moving into part 1's place takes on first_part_extra; part 1 stays empty if that does not fit
+        if loads[kept[0]] + first_part_extra <= limit(0):
+            loads[kept[0]] += first_part_extra
+        else:
+            kept.insert(0, 0)
+    return [(loads[i], members[i]) for i in kept]
+# --- Locality Section ---
+def locality_groups(items, capacity, size_key="EffectiveLength"):
+    # Cuts the project tree into groups that fit in capacity: a directory (or a file's sections) whose items fit
+    # together is one group, a larger one is broken up into its subdirectories and files. Groups come in path order,
+    # each with its items in path order.
+    entries = [((tuple(item["OriginalPath"].split("/")), item["SectionIndex"]), item) for item in items]
+    entries.sort(key=lambda entry: entry[0])
+    groups = []
+    def cut(run, depth):
+        if sum(item[size_key] for _, item in run) <= capacity:
+            groups.append([item for _, item in run])
+        elif all(len(key[0]) <= depth for key, _ in run): # Sections of one file that do not fit together
+            groups.extend([item] for _, item in run)
+        else:
+            for _, child in groupby(run, key=lambda entry: entry[0][0][depth] if len(entry[0][0]) > depth else None):
+                cut(list(child), depth + 1)
+    if entries:
+        cut(entries, 0)
+    return groups
+def pack_by_locality(items, max_part_size, base_length, first_part_extra=0, slack=0.1, size_key="EffectiveLength"):
+    # Keeps related files together: the groups from locality_groups fill parts in path order, so every part holds a
+    # contiguous stretch of the tree. When that needs more than slack (a fraction) extra parts over best fit, whole
+    # groups are packed best fit instead, and when that still needs too many, single items are.
+    # Returns ([(size, items)] for part 1, 2, ..., name of the layout used, parts best fit needs).
+    best_fit = pack_best_fit(items, max_part_size, base_length, first_part_extra, size_key=size_key)
+    allowed = len(best_fit) + math.ceil(len(best_fit) * slack)
+    def limit(index):
+        return max_part_size - (first_part_extra if index == 0 else 0)
+    groups = locality_groups(items, limit(0) - base_length - first_part_extra, size_key) # Room in part 1, the smallest
+    parts = []
+    for group in groups:
+        size = sum(item[size_key] for item in group)
+        if not parts or parts[-1][0] + size > limit(len(parts) - 1):
+            parts.append([base_length + (first_part_extra if not parts else 0), []])
+        parts[-1][0] += size
+        parts[-1][1].extend(group)
+    if len(parts) <= allowed:
+        return [tuple(part) for part in parts], "directory order", len(best_fit)
+    grouped = pack_best_fit([{size_key: sum(item[size_key] for item in group), "Group": group} for group in groups], max_part_size, base_length, first_part_extra, size_key=size_key)
+    if len(grouped) <= allowed:
+        parts = [(size, sorted((item for entry in part for item in entry["Group"]), key=lambda x: (x["OriginalPath"], x["SectionIndex"]))) for size, part in grouped]
+        return parts, "whole directories", len(best_fit)
+    return best_fit, "best fit", len(best_fit)
+# TODO (Enhancement): Group files by their imports as well as by directory.
+# TODO (Enhancement): Keep the room list in a balanced tree so dumps with tens of thousands of parts avoid list shifts.
@@ -0,0 +1,50 @@
+# part_writer.py
+# --- Imports Section ---
+import os
+import base64
+import filecmp
+# --- Constants Section ---
+BASE64_CHUNK = 3 * 256 * 1024 # Raw bytes encoded per step; a multiple of 3 so chunks concatenate without padding
+# --- Base64 Streaming Section ---
+def base64_length(raw_size):
+    return 4 * ((raw_size + 2) // 3)
+def write_base64_range(out, file_path, start, end):
+    # Writes characters [start, end) of the file's base64 encoding, holding at most one chunk in memory
+    raw_start = (start // 4) * 3
+    skip = start % 4
+    remaining = end - start
+    with open(file_path, "rb") as f:
+        f.seek(raw_start)
+        while remaining > 0:
+            block = f.read(BASE64_CHUNK)
+            if not block:
+                break
+            encoded = base64.b64encode(block).decode("ascii")
+            if skip:
+                encoded = encoded[skip:]
+                skip = 0
+            if len(encoded) > remaining:
+                encoded = encoded[:remaining]
+            out.write(encoded)
+            remaining -= len(encoded)
+# --- Part Writer Section ---
+def write_part(output_path, part_header, items, only_if_changed=False):
+    # Streams a part to disk section by section. Items with a "Payload" (file_path, start, end) have their base64
+    # written between "FileSection" and "SectionTail". With only_if_changed the part is written to a temporary file
+    # and an identical existing part is left untouched; returns False in that case.
+    target = output_path + ".tmp" if only_if_changed else output_path
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(part_header)
+        for item in items:
+            f.write(item["FileSection"])
+            payload = item.get("Payload")
+            if payload is not None:
+                write_base64_range(f, *payload)
+                f.write(item["SectionTail"])
+    if only_if_changed:
+        if os.path.exists(output_path) and filecmp.cmp(target, output_path, shallow=False):
+            os.remove(target)
+            return False
+        os.replace(target, output_path)
+    return True
+# TODO (Enhancement): Wrap streamed base64 at 76 characters per line for viewers that struggle with very long lines.
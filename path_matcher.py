@@ -0,0 +1,128 @@
+# path_matcher.py
+# --- Imports Section ---
+import os
+import re
+# --- Glob Conversion Section ---
+def glob_to_regex(pattern):
+    try:
+        temp_any = "TEMP_RECURSIVE_ANY"
+        regex = re.sub(r'\\', '/', pattern)
+        regex = re.sub(r'([.+^${}()|[\]])', r'\\\1', regex)
+        regex = regex.replace('**', temp_any)
+        regex = re.sub(r'\*', '[^/]*', regex)
+        regex = regex.replace(temp_any, '.*')
+        return f"^{regex}$"
+    except re.error as e:
+        raise ValueError(f"Invalid glob pattern '{pattern}': {e}")
+def _is_literal(text):
+    # '?' is passed through to the regex by glob_to_regex, so it is not literal either
+    return '*' not in text and '?' not in text
+def path_suffix(name):
+    # Same result as pathlib.PurePath(name).suffix, without building a Path object
+    ext = os.path.splitext(name)[1]
+    return "" if ext == "." else ext
+# --- Pattern Set Section ---
+class PatternSet:
+    # Patterns are bucketed by shape so the common cases never reach the regex engine:
+    #   literal           "CMakeLists.txt"    -> exact lookup
+    #   "<literal>/**"    "node_modules/**"   -> directory prefix lookup
+    #   "**<literal>"     "**/.env"           -> endswith (anywhere)
+    #   "**/*<literal>"   "**/*.log"          -> endswith, nested paths only
+    #   "*<literal>"      "*.sln"             -> endswith, root paths only
+    # Everything else is compiled once into a single alternation.
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.literals = set()
+        self.dir_prefixes = set()
+        suffixes_any = []
+        suffixes_nested = []
+        suffixes_root = []
+        regexes = []
+        dir_regexes = []
+        for pattern in self.patterns:
+            glob = pattern.replace('\\', '/')
+            lowered = glob.lower()
+            if _is_literal(lowered):
+                self.literals.add(lowered)
+            elif lowered.endswith('/**') and _is_literal(lowered[:-3]):
+                self.dir_prefixes.add(lowered[:-3])
+            elif lowered.startswith('**/*') and _is_literal(lowered[4:]) and '/' not in lowered[4:]:
+                suffixes_nested.append(lowered[4:])
+            elif lowered.startswith('**') and _is_literal(lowered[2:]):
+                suffixes_any.append(lowered[2:])
+            elif lowered.startswith('*') and _is_literal(lowered[1:]) and '/' not in lowered[1:]:
+                suffixes_root.append(lowered[1:])
+            else:
+                regex = glob_to_regex(pattern)
+                try:
+                    re.compile(regex, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError(f"Invalid glob pattern '{pattern}': {e}")
+                regexes.append(regex)
+                if glob.endswith('/**'):
+                    # "<dir glob>/**" matches every path below any directory matched by "<dir glob>"
+                    dir_regexes.append(glob_to_regex(glob[:-3]))
+        self.suffixes_any = tuple(suffixes_any)
+        self.suffixes_nested = tuple(suffixes_nested)
+        self.suffixes_root = tuple(suffixes_root)
+        self.regex = re.compile("|".join(f"(?:{r})" for r in regexes), re.IGNORECASE) if regexes else None
+        self.dir_regex = re.compile("|".join(f"(?:{r})" for r in dir_regexes), re.IGNORECASE) if dir_regexes else None
+    def __bool__(self):
+        return bool(self.patterns)
+    def matches(self, lowered_path):
+        if lowered_path in self.literals:
+            return True
+        if self.dir_prefixes:
+            slash = lowered_path.find('/')
+            while slash != -1:
+                if lowered_path[:slash] in self.dir_prefixes:
+                    return True
+                slash = lowered_path.find('/', slash + 1)
+        if self.suffixes_any and lowered_path.endswith(self.suffixes_any):
+            return True
+        if self.suffixes_nested and '/' in lowered_path and lowered_path.endswith(self.suffixes_nested):
+            return True
+        if self.suffixes_root and '/' not in lowered_path and lowered_path.endswith(self.suffixes_root):
+            return True
+        if self.regex is not None and self.regex.match(lowered_path):
+            return True
+        return False
+    def matches_tree(self, lowered_dir):
+        # True when every path below the directory is guaranteed to match, so the walk can skip it entirely
+        if self.dir_prefixes:
+            if lowered_dir in self.dir_prefixes:
+                return True
+            slash = lowered_dir.find('/')
+            while slash != -1:
+                if lowered_dir[:slash] in self.dir_prefixes:
+                    return True
+                slash = lowered_dir.find('/', slash + 1)
+        if '' in self.suffixes_any:
+            return True
+        if self.dir_regex is not None and self.dir_regex.match(lowered_dir):
+            return True
+        return False
+# --- Path Matcher Section ---
+class PathMatcher:
+    # Built once per run from the merged Extensions/IncludePatterns/Exclude lists and shared by every walker.
+    def __init__(self, extensions, include_patterns, exclude_patterns):
+        self.extensions = frozenset(e.lower() for e in extensions)
+        self.include = PatternSet(include_patterns)
+        self.exclude = PatternSet(exclude_patterns)
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get("Extensions", []), config.get("IncludePatterns", []), config.get("Exclude", []))
+    def rejection_reason(self, relative_path):
+        lowered = relative_path.replace('\\', '/').lower()
+        name = lowered.rsplit('/', 1)[-1]
+        if path_suffix(name) not in self.extensions and not self.include.matches(lowered):
+            return "No ext match and no include pattern"
+        if self.exclude.matches(lowered):
+            return "Matches exclude pattern"
+        return None
+    def includes(self, relative_path):
+        return self.rejection_reason(relative_path) is None
+    def excludes_dir(self, relative_dir):
+        # Exclude wins over extensions and include patterns, so a fully excluded directory can never produce a match
+        return self.exclude.matches_tree(relative_dir.replace('\\', '/').lower())
+# TODO (Enhancement): Support '?' and character classes as real glob wildcards once existing configs are migrated.
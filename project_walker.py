@@ -0,0 +1,128 @@
+# project_walker.py
+# --- Imports Section ---
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+# --- Constants Section ---
+DEFAULT_WALK_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEDUP_FILE_INODES = os.name != "nt" # DirEntry.inode() costs an extra stat call on Windows
+# --- Directory Scan Section ---
+def _dir_key(stat_result):
+    # Some filesystems (and DirEntry.stat() on Windows) report no inode, which would collapse every entry into one
+    if not stat_result.st_ino:
+        return None
+    return (stat_result.st_dev, stat_result.st_ino)
+def _scan_dir(abs_dir, rel_prefix, dir_key, follow_symlinks):
+    subdirs = []
+    links = []
+    files = []
+    # Entries share the directory's device; only mount points (directories) can differ
+    dir_dev = dir_key[0] if dir_key and DEDUP_FILE_INODES else None
+    try:
+        with os.scandir(abs_dir) as it:
+            entries = list(it)
+    except OSError as e:
+        logging.warning(f"Cannot list directory {abs_dir}: {e}")
+        return rel_prefix[:-1], subdirs, links, files
+    for entry in entries:
+        rel_path = rel_prefix + entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((rel_path, entry, entry.stat(follow_symlinks=False)))
+            elif entry.is_symlink() and follow_symlinks and entry.is_dir():
+                links.append((rel_path, entry))
+            elif entry.is_file():
+                file_key = (dir_dev, entry.inode()) if dir_dev is not None and entry.inode() else None
+                files.append((rel_path, entry, file_key))
+        except OSError as e:
+            logging.warning(f"Cannot stat {entry.path}: {e}")
+    return rel_prefix[:-1], subdirs, links, files
+# --- Walker Section ---
+def walk_project(root_dir, dir_filter=None, workers=None, follow_symlinks=False, stats=None, on_dir=None, dir_mtimes=None, file_filter=None, dedup_files=True):
+    # Lists directories concurrently on a thread pool; the calling thread owns all bookkeeping, so no locks are needed.
+    # Symlinked directories are skipped, as os.walk does, unless follow_symlinks is set. They are then walked after
+    # the real directories, in sorted order, which keeps the result deterministic while (st_dev, st_ino) tracking
+    # stops loops and duplicate subtrees. Files rejected by file_filter(rel_path) are dropped before hardlinked
+    # duplicates are, so a link that is filtered out never hides one that is wanted; dedup_files=False keeps every path.
+    seen_dirs = set()
+    collected = []
+    pruned_dirs = 0
+    duplicate_dirs = 0
+    scanned_dirs = 0
+    try:
+        root_stat = os.stat(root_dir)
+        root_key = _dir_key(root_stat)
+        if dir_mtimes is not None:
+            dir_mtimes[root_dir] = root_stat.st_mtime_ns
+    except OSError as e:
+        logging.info(f"Cannot stat walk root {root_dir}: {e}")
+        root_key = None
+    if root_key:
+        seen_dirs.add(root_key)
+    round_dirs = [(root_dir, "", root_key)]
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WALK_WORKERS) as pool:
+        while round_dirs:
+            deferred_links = []
+            pending = {pool.submit(_scan_dir, abs_dir, rel_prefix, dir_key, follow_symlinks) for abs_dir, rel_prefix, dir_key in round_dirs}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rel_dir, subdirs, links, files = future.result()
+                    scanned_dirs += 1
+                    if on_dir is not None:
+                        # Runs before any child is filtered, so per-directory state (e.g. .gitignore rules) is ready in time
+                        on_dir(rel_dir, [entry.name for _, entry, _ in files])
+                    collected.extend(files)
+                    deferred_links.extend(links)
+                    for rel_path, entry, stat_result in subdirs:
+                        if dir_filter is not None and not dir_filter(rel_path):
+                            pruned_dirs += 1
+                            continue
+                        key = _dir_key(stat_result)
+                        if key is not None:
+                            if key in seen_dirs:
+                                duplicate_dirs += 1
+                                continue
+                            seen_dirs.add(key)
+                        if dir_mtimes is not None:
+                            dir_mtimes[entry.path] = stat_result.st_mtime_ns
+                        pending.add(pool.submit(_scan_dir, entry.path, rel_path + "/", key, follow_symlinks))
+            round_dirs = []
+            for rel_path, entry in sorted(deferred_links, key=lambda link: link[0]):
+                if dir_filter is not None and not dir_filter(rel_path):
+                    pruned_dirs += 1
+                    continue
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    continue
+                key = _dir_key(stat_result)
+                if key is not None:
+                    if key in seen_dirs:
+                        duplicate_dirs += 1
+                        logging.info(f"Skipping symlinked directory {rel_path} (already walked or loop)")
+                        continue
+                    seen_dirs.add(key)
+                if dir_mtimes is not None:
+                    dir_mtimes[entry.path] = stat_result.st_mtime_ns
+                round_dirs.append((entry.path, rel_path + "/", key))
+    collected.sort(key=lambda item: item[0])
+    seen_files = set()
+    results = []
+    duplicate_files = 0
+    for rel_path, entry, key in collected:
+        if file_filter is not None and not file_filter(rel_path):
+            continue
+        if key is not None and dedup_files:
+            if key in seen_files:
+                duplicate_files += 1
+                continue
+            seen_files.add(key)
+        results.append((rel_path, entry))
+    if stats is not None:
+        stats["ScannedDirs"] = scanned_dirs
+        stats["PrunedDirs"] = pruned_dirs
+        stats["DuplicateDirs"] = duplicate_dirs
+        stats["DuplicateFiles"] = duplicate_files
+    return results
+# TODO (Enhancement): Expose the worker count in the GUI for very slow network shares.
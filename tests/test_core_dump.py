@@ -0,0 +1,30 @@
+# tests/test_core_dump.py
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_dump import collect_files
+from file_worker import _token_cuts
+from token_estimator import ApproxTokenEstimator
+def test_token_cuts_continue_until_the_last_section():
+    # The dense middle is re-cut at its own density; sections cut from it must still continue
+    content = "a b c d e f\n" * 200 + "!~!~!~!~!~!~!~!~\n" * 300 + "word\n" * 50
+    cuts = _token_cuts(content, 200, 150, "dense.txt", ApproxTokenEstimator())
+    assert [has_continuation for _, _, has_continuation in cuts] == [True] * (len(cuts) - 1) + [False]
+    assert cuts[0][0] == 0 and cuts[-1][1] == len(content)
+    assert all(end == start for (_, end, _), (start, _, _) in zip(cuts, cuts[1:]))
+def test_project_config_excludes_prune_the_walk(tmp_path):
+    (tmp_path / ".dump-project.json").write_text('{"Exclude": ["vendored/**"]}')
+    (tmp_path / "main.py").write_text("x = 1\n")
+    for i in range(3):
+        (tmp_path / "vendored" / f"pkg{i}").mkdir(parents=True)
+        (tmp_path / "vendored" / f"pkg{i}" / "m.py").write_text("y = 2\n")
+    stats = {}
+    files = collect_files(str(tmp_path), {"Extensions": [".py"], "IncludePatterns": [], "Exclude": []}, stats=stats, project_config={})
+    assert [os.path.basename(f) for f in files] == ["main.py"]
+    assert stats["PrunedDirs"] == 1 and stats["ScannedDirs"] == 1
+def test_hardlink_dedup_keeps_the_included_name(tmp_path):
+    (tmp_path / "a.txt").write_text("x = 1\n")
+    os.link(tmp_path / "a.txt", tmp_path / "b.py")
+    config = {"Extensions": [".py"], "IncludePatterns": [], "Exclude": []}
+    assert [os.path.basename(f) for f in collect_files(str(tmp_path), config)] == ["b.py"]
+    assert sorted(os.path.basename(f) for f in collect_files(str(tmp_path), config, full_backup=True)) == ["a.txt", "b.py"]
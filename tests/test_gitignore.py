@@ -0,0 +1,17 @@
+# tests/test_gitignore.py
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gitignore import GitignoreRules
+def test_rules_are_case_sensitive_by_default():
+    rules = GitignoreRules(["build/\n", "*.log\n", "docs/*.TMP\n"])
+    assert rules.match("build", "build", True) is True
+    assert rules.match("Build", "Build", True) is None
+    assert rules.match("a.log", "a.log", False) is True
+    assert rules.match("A.LOG", "A.LOG", False) is None
+    assert rules.match("docs/x.tmp", "x.tmp", False) is None
+def test_ignore_case_follows_core_ignorecase():
+    rules = GitignoreRules(["build/\n", "*.log\n", "!Keep.LOG\n"], ignore_case=True)
+    assert rules.match("BUILD", "BUILD", True) is True
+    assert rules.match("a.LOG", "a.LOG", False) is True
+    assert rules.match("keep.log", "keep.log", False) is False
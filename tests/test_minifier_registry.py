@@ -0,0 +1,14 @@
+# tests/test_minifier_registry.py
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from minifier_registry import MinifierRegistry, MinifierBackend
+def _broken(content):
+    raise RuntimeError("plugin bug")
+def test_backend_that_raises_counts_as_declined():
+    registry = MinifierRegistry()
+    registry.add_backend(MinifierBackend("broken", _broken))
+    registry.add_backend(MinifierBackend("upper", lambda content: content.upper()))
+    registry.set_chain(".txt", ["broken", "upper"])
+    assert registry.minify(".txt", "abc") == ("ABC", "upper")
+    assert registry.backends["broken"].declined == 1
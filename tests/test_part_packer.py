@@ -0,0 +1,13 @@
+# tests/test_part_packer.py
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from part_packer import pack_best_fit
+def _item(path, size):
+    return {"RelativePath": path, "EffectiveLength": size}
+def test_stable_packing_leaves_no_empty_parts():
+    # The files were in parts 2 and 5 last time; now one part holds them both
+    items = [_item("a.py", 100), _item("b.py", 100), _item("c.py", 100)]
+    parts = pack_best_fit(items, 1000, 10, previous_parts={"a.py": 2, "b.py": 5})
+    assert [[item["RelativePath"] for item in part] for _, part in parts] == [["a.py", "c.py"], ["b.py"]]
+    assert [size for size, _ in parts] == [210, 110]
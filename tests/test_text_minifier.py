@@ -0,0 +1,19 @@
+# tests/test_text_minifier.py
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_minifier import minify_js, minify_python
+def test_jsx_text_with_url_is_not_cut_at_double_slash():
+    source = 'const a = <a href="x">see http://example.com</a>;\nfoo()'
+    assert minify_js(source) == source
+def test_jsx_text_with_apostrophe_is_left_unchanged():
+    source = "return (\n  <div>\n    <p>Don't // stop</p>\n  </div>\n);"
+    assert minify_js(source) == source
+def test_comparisons_and_generics_are_still_minified():
+    assert minify_js("if (a < b && c<d) { x = y<z; } // c\nf(a<b>c)") == "if(a<b&&c<d){x=y<z;}\nf(a<b>c)"
+    assert minify_js("const m: Map<string, number> = new Map<string, number>();") == "const m:Map<string,number>=new Map<string,number>();"
+def test_statement_after_stripped_docstring_still_compiles():
+    for source in ('def f():\n    """doc"""; return 1\n', '"""doc"""; import os\n', 'class C:\n    "a" "b" ; x = 1\n'):
+        minified = minify_python(source)
+        compile(minified, "<minified>", "exec")
+        assert '"' not in minified
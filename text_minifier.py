@@ -0,0 +1,314 @@
+# text_minifier.py
+# --- Imports Section ---
+import io
+import re
+import ast
+import logging
+import tokenize
+from itertools import chain
+# --- Constants Section ---
+PLACEHOLDER = "\x00" # Stands in for the inside of a literal while whitespace is collapsed around it
+TEMPLATE_NESTING = 3 # Levels of `${`...`}` nesting the JS lexer follows; deeper files are left unminified
+REGEX_PRECEDERS = "(,=:[!&|?{};+-*%<>~^" # After these a "/" starts a regex literal rather than a division
+REGEX_KEYWORDS = ["return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await"]
+JS_SCRIPT_TYPES = frozenset(["", "text/javascript", "application/javascript", "module", "text/ecmascript", "application/ecmascript"])
+# --- Lexer Patterns Section ---
+STRING = r"\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*\"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+BLOCK_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+REGEX_BODY = r"(?:[^/\\\[\n]|\\[^\n]|\[(?:[^\]\\\n]|\\[^\n])*\])+/[A-Za-z]*"
+ID = r"[\w$\\\x80-\uffff]"
+ID_NO_DIGIT = r"(?:[^\W\d]|[$\\\x80-\uffff])"
+SPACE = r"[^\S\n]"
+COMMENT_STARTS = ("//", "/*")
+def _template_pattern(depth):
+    # A template literal whose ${...} expressions may hold strings, one level of braces and templates nested `depth` deep
+    template = r"`[^`\\$]*(?:(?:\\.|\$(?!\{))[^`\\$]*)*`"
+    for _ in range(depth):
+        expression = rf"(?:[^{{}}`\"']|{STRING}|\{{[^{{}}`]*\}}|{template})*"
+        template = rf"`[^`\\$]*(?:(?:\\.|\$(?!\{{)|\$\{{{expression}\}})[^`\\$]*)*`"
+    return template
+def _regex_literal_pattern():
+    # Every alternative starts with "/" (or a newline) so the scanner only stops on those characters; the lookbehinds then
+    # check the previous token, allowing for one space or a line break with indentation in between
+    preceders = "[" + re.escape(REGEX_PRECEDERS) + "]"
+    after = [rf"(?<=\A/)", rf"(?<={preceders}/)", rf"(?<={preceders}{SPACE}/)", rf"(?<={preceders}\n/)"]
+    for length in sorted(set(map(len, REGEX_KEYWORDS))):
+        # Lookbehinds must have a fixed width, so keywords are grouped by length
+        keywords = "|".join(keyword for keyword in REGEX_KEYWORDS if len(keyword) == length)
+        after += [rf"(?<=[^\w$.](?:{keywords})/)", rf"(?<=[^\w$.](?:{keywords}){SPACE}/)"]
+    return rf"/(?![*/])(?:{'|'.join(after)}){REGEX_BODY}|\n(?<={preceders}\n)\s*/(?![*/]){REGEX_BODY}"
+# --- JavaScript Section ---
+# Matches literals and comments; the text between matches is code. A single group keeps the scanner's first-character
+# optimisation, so comments are told apart from literals afterwards by their opening characters.
+JS_LEXER_RE = re.compile(rf"({STRING}|{_template_pattern(TEMPLATE_NESTING)}|{_regex_literal_pattern()}|{BLOCK_COMMENT}|//[^\n]*)")
+# Spaces (including indentation and trailing spaces) are dropped unless they separate two words, "+ +", "- -", "/ /",
+# "/ *" or "1 ."
+JS_SPACE_DROP_RE = re.compile(
+    rf"{SPACE}(?:(?<![\w$\\\x80-\uffff+\-/]{SPACE}){SPACE}*|(?<={ID_NO_DIGIT}{SPACE}){SPACE}*(?!{SPACE}|{ID})|(?<=[0-9]{SPACE}){SPACE}*(?!{SPACE}|{ID}|\.)"
+    rf"|(?<=\+{SPACE}){SPACE}*(?!{SPACE}|\+)|(?<=-{SPACE}){SPACE}*(?!{SPACE}|-)|(?<=/{SPACE}){SPACE}*(?!{SPACE}|[/*]))")
+JS_BLANK_LINES_RE = re.compile(r"\n\n+")
+# A line break survives only after a token that can end a statement and before one that can start the next, because
+# automatic semicolon insertion may depend on it
+JS_NEWLINE_DROP_RE = re.compile(r"\n(?<![\w$\\\x80-\uffff)\]}'\"`+\-/]\n)|\n(?![\w$\\\x80-\uffff(\[{'\"`+\-!~/#@]|(?<=[0-9]\n)\.)")
+# A JSX element or fragment where an expression starts. Its children are text, in which "//" and quotes are not
+# comments or strings, so the lexer cannot be trusted with the file (TypeScript's <Type>value casts match as well).
+JSX_ELEMENT_RE = re.compile(r"(?:^|[=(,:?&|!{}\[;]|=>|\breturn|\bdefault|\byield)\s*<(?:[A-Za-z_$][\w$.:-]*(?:\s|/?>)|>)", re.M)
+def _lex(lexer, content, kept_comments=("/*!",), comment_newlines=True):
+    # Splits content into code with each literal reduced to first char + PLACEHOLDER + last char (so the whitespace
+    # rules still see its edges), and the list of literal insides. Comments starting with kept_comments count as
+    # literals; the others become a space, or a newline if they span lines and comment_newlines is set. The lexer's
+    # first group is the token; further groups only serve backreferences.
+    step = lexer.groups + 1
+    parts = lexer.split(content)
+    # lstrip: a regex literal at the start of a line is matched together with the line break and indentation before it
+    tokens = [token.lstrip() for token in parts[1::step]]
+    markers = [token[0] + PLACEHOLDER + token[-1] if not token.startswith(COMMENT_STARTS) or token.startswith(kept_comments)
+               else ("\n" if comment_newlines and "\n" in token else " ") for token in tokens]
+    markers.append("")
+    code = "".join(chain.from_iterable(zip(parts[0::step], markers)))
+    return code, [token[1:-1] for token in tokens if not token.startswith(COMMENT_STARTS) or token.startswith(kept_comments)]
+def _join_literals(code, literals):
+    literals.append("")
+    return "".join(chain.from_iterable(zip(code.split(PLACEHOLDER), literals)))
+def minify_js(content):
+    # JS/TS in one lexing pass: strings, template literals, regex literals and /*! comments are kept verbatim, other
+    # comments are dropped and whitespace between code tokens is removed by three substitutions on the literal-free code.
+    # Files with JSX elements are returned unchanged.
+    if PLACEHOLDER in content:
+        return content
+    prefix = ""
+    if content.startswith("#!"):
+        end = content.find("\n") + 1
+        if not end:
+            return content
+        prefix, content = content[:end], content[end:]
+    code, literals = _lex(JS_LEXER_RE, content)
+    if JSX_ELEMENT_RE.search(code):
+        logging.debug("JSX element found, leaving file unminified")
+        return prefix + content
+    if "`" in code.replace("`" + PLACEHOLDER + "`", ""):
+        logging.debug("Template literal nested too deeply or unterminated, leaving file unminified")
+        return prefix + content
+    code = JS_SPACE_DROP_RE.sub("", code)
+    code = JS_BLANK_LINES_RE.sub("\n", code)
+    code = JS_NEWLINE_DROP_RE.sub("", code)
+    return prefix + _join_literals(code, literals)
+# --- CSS Section ---
+CSS_LEXER_RE = re.compile(rf"({STRING}|{BLOCK_COMMENT})")
+CSS_WHITESPACE_RE = re.compile(r"\s+")
+# Spaces are dropped after "{};,:>~(" and before "{};,>~!)" (they are significant in selectors and calc()), as are
+# semicolons before "}"
+CSS_SPACE_DROP_RE = re.compile(r"\A | \Z| (?<=[{};,:>~(] )| (?=[{};,>~!)])|;+(?= ?\})")
+def minify_css(content):
+    if PLACEHOLDER in content:
+        return content
+    code, literals = _lex(CSS_LEXER_RE, content)
+    code = CSS_WHITESPACE_RE.sub(" ", code)
+    code = CSS_SPACE_DROP_RE.sub("", code)
+    return _join_literals(code, literals)
+# --- HTML Section ---
+HTML_TOKEN_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style|pre|textarea)\b((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>(.*?)</\1\s*>"
+    r"|<[!?/]?[A-Za-z](?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.S | re.I)
+HTML_TAG_SPACE_RE = re.compile(r"(\"[^\"]*\"|'[^']*')|(\s)\s*")
+HTML_SCRIPT_TYPE_RE = re.compile(r"\btype\s*=\s*[\"']?([^\"'\s>]*)", re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+def _minify_tag(tag):
+    # Collapses whitespace between attributes; quoted attribute values are left alone
+    return HTML_TAG_SPACE_RE.sub(r"\1\2", tag)
+def minify_html(content):
+    # Comments (other than conditional comments) are dropped, whitespace between tags is removed and text whitespace
+    # collapsed. <pre> and <textarea> are kept verbatim; inline <script> and <style> go through minify_js and minify_css.
+    out = []
+    pos = 0
+    for match in HTML_TOKEN_RE.finditer(content):
+        text = content[pos:match.start()]
+        if text and not text.isspace():
+            out.append(WHITESPACE_RE.sub(" ", text))
+        pos = match.end()
+        token = match.group()
+        element = match.group(1)
+        if token.startswith("<!--"):
+            if token.startswith("<!--[if") or token.endswith("<![endif]-->"):
+                out.append(token)
+            continue
+        if element is None:
+            out.append(_minify_tag(token))
+            continue
+        element = element.lower()
+        attributes, body = match.group(2), match.group(3)
+        if element == "script":
+            script_type = HTML_SCRIPT_TYPE_RE.search(attributes)
+            if script_type is None or script_type.group(1).lower() in JS_SCRIPT_TYPES:
+                body = minify_js(body)
+        elif element == "style":
+            body = minify_css(body)
+        out.append(_minify_tag(f"<{match.group(1)}{attributes}>") + body + token[match.end(3) - match.start():])
+    text = content[pos:]
+    if text and not text.isspace():
+        out.append(WHITESPACE_RE.sub(" ", text))
+    return "".join(out).strip()
+# --- C-Family Section ---
+COMMENT_NESTING = 3 # Levels of nested /* */ comments followed in Rust and Kotlin; deeper files are left unminified
+def _nested_comment_pattern(depth):
+    comment = r"/\*(?:[^*/]|\*(?!/)|/(?!\*))*\*/"
+    for _ in range(depth):
+        comment = rf"/\*(?:[^*/]|\*(?!/)|/(?!\*)|{comment})*\*/"
+    return comment
+def _c_lexer_pattern(line_splices=False, nested_comments=False):
+    # One lexer for C, C++, C#, Java, Go, Rust and Kotlin: C++ raw strings R"d(...)d", Rust raw strings r#"..."#,
+    # Java/C#/Kotlin text blocks, C# verbatim strings, Go raw strings, plain strings (which may span lines in Rust
+    # and C), char literals (not after a digit, so C++14 digit separators and Rust lifetimes stay code) and comments
+    block_comment = _nested_comment_pattern(COMMENT_NESTING) if nested_comments else BLOCK_COMMENT
+    line_comment = r"//(?:[^\n\\]|\\[\s\S])*" if line_splices else r"//[^\n]*"
+    return re.compile(
+        r"((?<![\w$])(?:u8|[uUL])?R\"([^()\\\s\"]{0,16})\((?:[^)]|\)(?!\2\"))*\)\2\""
+        r"|(?<![\w$])[bc]?r(#*)\"[\s\S]*?\"\3"
+        r"|(\"{3,})(?:[^\"\\]|\\[\s\S]|\"(?!\4))*\4"
+        r"|(?:@\$?|\$@)\"(?:[^\"]|\"\")*\""
+        r"|\"[^\"\\]*(?:\\[\s\S][^\"\\]*)*\""
+        r"|`[^`]*`"
+        r"|(?:(?<!\d)|(?<=u8))'(?:[^'\\\n]|\\[^\n][^'\\\n]*)'"
+        rf"|{block_comment}|{line_comment})")
+C_LEXER_RE = _c_lexer_pattern(line_splices=True)
+C_FAMILY_LEXER_RE = _c_lexer_pattern()
+C_NESTED_LEXER_RE = _c_lexer_pattern(nested_comments=True)
+C_WORD_CHARS = r"\w$@#\\\x80-\uffff\"'`"
+C_OPERATOR_CHARS = r"\-+*/%&|^<>=!:.?"
+C_WORD = f"[{C_WORD_CHARS}]"
+C_OPERATOR = f"[{C_OPERATOR_CHARS}]"
+# Spaces are dropped unless they separate two words or literals, two operator characters (so "a - -b", "x & &y" and
+# "a < ::b" keep their meaning), a number and a "." or a "." and a number
+C_SPACE_DROP_RE = re.compile(
+    rf"{SPACE}(?:(?<![{C_WORD_CHARS}{C_OPERATOR_CHARS}]{SPACE}){SPACE}*|(?<={C_WORD}{SPACE})(?<![0-9]{SPACE}){SPACE}*(?!{SPACE}|{C_WORD})"
+    rf"|(?<=[0-9]{SPACE}){SPACE}*(?!{SPACE}|{C_WORD}|\.)|(?<={C_OPERATOR}{SPACE})(?<!\.{SPACE}){SPACE}*(?!{SPACE}|{C_OPERATOR})"
+    rf"|(?<=\.{SPACE}){SPACE}*(?!{SPACE}|{C_OPERATOR}|[0-9]))")
+C_SPACE_RUN_RE = re.compile(rf"{SPACE}+")
+# Preprocessor directives (and C# directives, Rust attributes) end at the line break, so they keep their own line
+C_DIRECTIVE_RE = re.compile(r"^([ \t]*#[^\n]*(?:\n|\Z))", re.M)
+# Go and Kotlin end statements at line breaks; one is dropped only after a token that cannot end a statement or
+# before a closing bracket
+C_NEWLINE_DROP_RE = re.compile(r"\A\n+|\n+\Z|\n(?=\n)|\n(?<=[{(\[,;=&|^%:</]\n)|\n(?<=[^0-9]\.\n)|\n(?=[)\]}])")
+def minify_c_family(content, line_splices=False, newline_statements=False, nested_comments=False):
+    # C/C++ (line_splices: backslash-newline joins lines, also inside // comments), C#, Java, Rust (nested_comments)
+    # and Go and Kotlin (newline_statements: line breaks end statements). Literals are kept verbatim, comments are
+    # dropped and whitespace between tokens is removed; outside Go and Kotlin, code is joined onto as few lines as
+    # directives allow.
+    if PLACEHOLDER in content:
+        return content
+    lexer = C_LEXER_RE if line_splices else C_NESTED_LEXER_RE if nested_comments else C_FAMILY_LEXER_RE
+    code, literals = _lex(lexer, content, kept_comments=(), comment_newlines=newline_statements)
+    if nested_comments and "*/" in code:
+        logging.debug("Block comment nested too deeply, leaving file unminified")
+        return content
+    if newline_statements:
+        code = C_SPACE_DROP_RE.sub("", code)
+        code = C_NEWLINE_DROP_RE.sub("", code)
+        return _join_literals(code, literals)
+    if line_splices:
+        code = code.replace("\\\n", "")
+    parts = C_DIRECTIVE_RE.split(code)
+    out = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            out.append(C_SPACE_RUN_RE.sub(" ", part).strip() + "\n")
+        else:
+            part = C_SPACE_DROP_RE.sub("", part.replace("\n", " "))
+            if part:
+                out.append(part + "\n" if index + 1 < len(parts) else part)
+    return _join_literals("".join(out).rstrip("\n"), literals)
+# --- Python Section ---
+FSTRING_START = getattr(tokenize, "FSTRING_START", None) # Python 3.12+ splits f-strings into several tokens
+FSTRING_END = getattr(tokenize, "FSTRING_END", None)
+def _char_column(lines, lineno, byte_offset):
+    # ast reports UTF-8 byte offsets, tokenize reports character offsets
+    return len(lines[lineno - 1].encode("utf-8")[:byte_offset].decode("utf-8", "ignore"))
+def _docstrings(content, lines):
+    # Maps the (row, column) where each docstring starts to (where it ends, whether it is the only statement of its body)
+    spans = {}
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+                start = (first.lineno, _char_column(lines, first.lineno, first.col_offset))
+                end = (first.end_lineno, _char_column(lines, first.end_lineno, first.end_col_offset))
+                spans[start] = (end, len(node.body) == 1 and not isinstance(node, ast.Module))
+    return spans
+def _source_text(lines, start, end):
+    (start_row, start_col), (end_row, end_col) = start, end
+    if start_row == end_row:
+        return lines[start_row - 1][start_col:end_col]
+    return "\n".join([lines[start_row - 1][start_col:]] + lines[start_row:end_row - 1] + [lines[end_row - 1][:end_col]])
+def minify_python(content, strip_comments=True, strip_docstrings=True, indent=" "):
+    # Rebuilds the module from its tokens: blank lines are dropped, each block level is indented by `indent`, tokens
+    # are separated by a space only where two names, numbers or strings meet, and lines continued inside brackets or
+    # with a backslash are joined. Comments (except a shebang) and docstrings are dropped when asked; a body left empty
+    # gets "pass". Files that do not tokenize or parse are returned unchanged.
+    lines = content.split("\n")
+    try:
+        docstrings = _docstrings(content, lines) if strip_docstrings else {}
+        tokens = list(tokenize.generate_tokens(io.StringIO(content).readline))
+    except (SyntaxError, tokenize.TokenError, ValueError):
+        return content
+    out = []
+    depth = 0
+    brackets = 0
+    line_open = False
+    prev = None
+    skip_until = None
+    for index, token in enumerate(tokens):
+        kind, text = token.type, token.string
+        if skip_until is not None:
+            if token.start < skip_until:
+                continue
+            skip_until = None
+        if kind == tokenize.INDENT:
+            depth += 1
+            continue
+        if kind == tokenize.DEDENT:
+            depth -= 1
+            continue
+        if kind in (tokenize.NEWLINE, tokenize.NL):
+            if line_open and (brackets == 0 or prev.type == tokenize.COMMENT):
+                out.append("\n")
+                line_open = False
+            continue
+        if kind == tokenize.ENDMARKER:
+            break
+        if kind == tokenize.ERRORTOKEN:
+            return content
+        if kind == tokenize.COMMENT and strip_comments and not (token.start == (1, 0) and text.startswith("#!")):
+            continue
+        if kind == tokenize.STRING and token.start in docstrings:
+            skip_until, only_statement = docstrings[token.start]
+            if not only_statement:
+                # A statement after it on the same line must not be left starting with the ";" between them
+                following = next((tokens[i] for i in range(index + 1, len(tokens)) if tokens[i].start >= skip_until), None)
+                if following is not None and following.type == tokenize.OP and following.string == ";":
+                    skip_until = following.end
+                continue
+            kind, text = tokenize.NAME, "pass"
+        elif kind == FSTRING_START:
+            # Copied from the source as one literal so that format specs and nested quotes stay untouched
+            nesting = 0
+            for end_token in tokens[index:]:
+                nesting += (end_token.type == FSTRING_START) - (end_token.type == FSTRING_END)
+                if not nesting:
+                    break
+            text = _source_text(lines, token.start, end_token.end)
+            skip_until = end_token.end
+        elif kind == tokenize.OP:
+            if text in "([{":
+                brackets += 1
+            elif text in ")]}":
+                brackets -= 1
+        if not line_open:
+            out.append(indent * depth)
+            line_open = True
+        elif (kind != tokenize.OP and prev.type != tokenize.OP) or (prev.type == tokenize.NUMBER and text == "."):
+            out.append(" ")
+        out.append(text)
+        prev = token if kind == token.type else token._replace(type=kind, string=text)
+    return "".join(out)
+# TODO (Enhancement): Shorten local identifiers in JS when no external minifier is installed.
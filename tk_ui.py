@@ -220,6 +220,7 @@ class DumpApp:
         self.use_default_backup_path_var = tk.BooleanVar(value=default_use_default_backup_path)
         self.full_backup_var = tk.BooleanVar(value=custom_config.get("LastFullBackup", False))
         self.include_binary_var = tk.BooleanVar(value=custom_config.get("LastIncludeBinary", False))
+        self.since_last_var = tk.BooleanVar(value=custom_config.get("LastSinceLast", False))
         self.auto_save_interval_var = tk.StringVar(value=str(custom_config.get("AutoSaveIntervalMinutes", 5)))
         self.backup_interval_var = tk.StringVar(value=str(custom_config.get("BackupIntervalHours", 1)))
         self.backup_interval = int(self.backup_interval_var.get()) * 3600
@@ -343,7 +344,7 @@ class DumpApp:
             self.exclude_cmake_var, self.exclude_vscode_var, self.is_exclude_dynamic_var, self.input_type_var,
             self.use_placeholders_var, self.include_tree_var, self.parse_git_var, self.timestamp_var,
             self.max_output_parts_var, self.use_default_backup_path_var, self.full_backup_var, self.include_binary_var, self.auto_save_interval_var,
-            self.backup_interval_var
+            self.backup_interval_var, self.since_last_var
         ]
         for var in vars_to_trace:
             var.trace("w", self.on_var_change)
@@ -484,6 +485,9 @@ class DumpApp:
         self.timestamp_check = ttk.Checkbutton(dump_options_lf, text="Add Timestamp", variable=self.timestamp_var)
         self.timestamp_check.pack(side=tk.LEFT, padx=(0,10))
         Tooltip(self.timestamp_check, "Timestamp output files")
+        self.since_last_check = ttk.Checkbutton(dump_options_lf, text="Changes Only", variable=self.since_last_var)
+        self.since_last_check.pack(side=tk.LEFT, padx=(0,10))
+        Tooltip(self.since_last_check, "Only files changed since the last dump")
         self.include_tree_check = ttk.Checkbutton(dump_options_lf, text="Include Project Tree", variable=self.include_tree_var)
         self.include_tree_check.pack(side=tk.LEFT, padx=(0,10))
         Tooltip(self.include_tree_check, "Add project tree")
@@ -722,26 +726,10 @@ class DumpApp:
         include_patterns, exclude = apply_dynamic_patterns(include_patterns, exclude, self.parse_list(self.dynamic_text), self.is_exclude_dynamic_var.get())
         project_excludes, _ = load_project_config(project_dir)
         exclude.extend([p for p in project_excludes if p not in exclude])
-        if self.parse_git_var.get():
-            git_path = os.path.join(project_dir, '.gitignore')
-            if os.path.exists(git_path):
-                git_excludes = parse_gitignore(git_path)
-                exclude.extend([p for p in git_excludes if p not in exclude])
+        # .gitignore files are applied by do_backup when parse_git is enabled
         return {"Extensions": extensions, "IncludePatterns": include_patterns, "Exclude": exclude}
     def collect_files(self, dump_config, project_dir):
-        all_files = []
-        if self.full_backup_var.get():
-            for root, dirs, files in os.walk(project_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    all_files.append(file_path)
-        else:
-            for root, dirs, files in os.walk(project_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if should_include_file(file_path, dump_config, project_dir):
-                        all_files.append(file_path)
-        return all_files
+        return collect_files(project_dir, dump_config, self.full_backup_var.get())
     # --- Backup and Restore Actions Section ---
     def backup(self):
         if self.input_type_var.get() == "GitHub":
@@ -1188,6 +1176,8 @@ endlocal
         args_str += f" --max-output-parts {self.max_output_parts_var.get()}"
         if self.include_binary_var.get():
             args_str += " --include-binary"
+        if self.since_last_var.get():
+            args_str += " --since-last"
         args_str += f" --input-type {self.input_type_var.get()}"
         return args_str
     # --- File Browsing Section ---
@@ -1332,7 +1322,8 @@ endlocal
             "max_output_parts": max_output_parts,
             "include_binary": self.include_binary_var.get(),
             "preset_files": None,
-            "full_backup": self.full_backup_var.get()
+            "full_backup": self.full_backup_var.get(),
+            "since_last": self.since_last_var.get()
         }
     # --- Dump Execution Section ---
     def do_run_dump(self):
@@ -1393,6 +1384,7 @@ endlocal
                 "UseDefaultBackupPath": self.use_default_backup_path_var.get(),
                 "LastFullBackup": self.full_backup_var.get(),
                 "LastIncludeBinary": self.include_binary_var.get(),
+                "LastSinceLast": self.since_last_var.get(),
                 "DynamicPatterns": params["dynamic_patterns"],
                 "AutoSaveIntervalMinutes": int(self.auto_save_interval_var.get()),
                 "BackupIntervalHours": int(self.backup_interval_var.get())
@@ -0,0 +1,206 @@
+# token_estimator.py
+# --- Imports Section ---
+import re
+import abc
+import math
+import base64
+import hashlib
+import logging
+import threading
+from minifier_registry import load_callable
+try:
+    import regex # type: ignore # Gives the BPE pre-tokenizer real \p{L}/\p{N} classes
+except ImportError:
+    regex = None
+try:
+    import tiktoken # type: ignore
+except ImportError:
+    tiktoken = None
+# --- Constants Section ---
+SIZE_UNITS = ("chars", "tokens")
+MEMO_MIN_CHARS = 1024 # Shorter texts are counted again rather than hashed
+DEFAULT_MEMO_ENTRIES = 100000
+ALLOWANCE_CHARS_PER_TOKEN = 3 # Converts the dump's fixed allowances for headers, TOC lines and margins into tokens
+# Pre-tokenizer of the cl100k/o200k-era BPE vocabularies, and a stand-in for the re module without \p{...} classes
+BPE_PATTERN = r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+BPE_PATTERN_RE = r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|(?:[^\r\n\w]|_)?[^\W\d_]+|\d{1,3}| ?(?:[^\s\w]|_)+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+# Each match of the approximation is counted as one token: short words, capitalised runs, digit groups as BPE
+# vocabularies split numbers, one or two punctuation characters, a line break with its trailing blanks, runs of
+# indentation and every non-ASCII character. Long identifiers and base64 fall apart into several short matches.
+APPROX_TOKEN_RE = re.compile(r" ?[A-Z]{2,5}(?![a-z])| ?[A-Za-z][a-z]{0,7}|\d{1,3}| ?[!-/:-@\[-`{-~]{1,2}|[ \t]*[\r\n]+|[ \t]{2,16}|[\s\S]")
+# Random bytes encode to the densest base64 a binary file can produce; binary sections are sized from this sample
+BASE64_SAMPLE = base64.b64encode(hashlib.shake_256(b"token_estimator base64 sample").digest(3 * 4096)).decode("ascii")
+# --- Estimator Section ---
+class CharacterCounter:
+    # Sizes in characters, the dump's historical unit; every allowance is used as is
+    name = "chars"
+    unit = "chars"
+    def count(self, text):
+        return len(text)
+    def allowance(self, chars):
+        return chars
+    def base64_size(self, length):
+        return length
+    def base64_chars(self, size):
+        return size
+    def signature(self):
+        return self.name
+    def report(self):
+        return None
+class TokenEstimator(abc.ABC):
+    # Base class of the token-based sizes. count() memoises texts of MEMO_MIN_CHARS or more by a hash of their
+    # content, so files that are dumped again (watch mode, the GUI, vendored copies) are not counted twice;
+    # subclasses implement _count(text).
+    name = "tokens"
+    unit = "tokens"
+    def __init__(self, memo_entries=DEFAULT_MEMO_ENTRIES):
+        self.memo_entries = memo_entries
+        self.memo = {}
+        self.lock = threading.Lock()
+        self.base64_ratio = None
+        self.reset_stats()
+    def reset_stats(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+    def count(self, text):
+        if len(text) < MEMO_MIN_CHARS:
+            return self._count(text)
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        size = self.memo.get(key)
+        if size is not None:
+            with self.lock:
+                self.hits += 1
+            return size
+        size = self._count(text)
+        with self.lock:
+            self.misses += 1
+            if len(self.memo) >= self.memo_entries:
+                self.memo.clear()
+            self.memo[key] = size
+        return size
+    @abc.abstractmethod
+    def _count(self, text):
+        pass
+    def allowance(self, chars):
+        return -(-chars // ALLOWANCE_CHARS_PER_TOKEN)
+    def base64_size(self, length):
+        if self.base64_ratio is None:
+            self.base64_ratio = self._count(BASE64_SAMPLE) / len(BASE64_SAMPLE)
+        return math.ceil(length * self.base64_ratio)
+    def base64_chars(self, size):
+        self.base64_size(0)
+        return int(size / self.base64_ratio)
+    def signature(self):
+        return self.name
+    def report(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            if not lookups:
+                return None
+            return f"Token estimator {self.name}: {self.hits}/{lookups} memo hits, {len(self.memo)} texts remembered"
+class ApproxTokenEstimator(TokenEstimator):
+    # One regex pass and no vocabulary: fast, but only an estimate, so leave some headroom below the model's limit
+    name = "approx"
+    def _count(self, text):
+        return len(APPROX_TOKEN_RE.findall(text))
+class BpeTokenEstimator(TokenEstimator):
+    # Exact counts from a byte-level BPE vocabulary in tiktoken's format ("<base64 token> <rank>" per line), read from
+    # a local file. tiktoken does the encoding when it is installed; otherwise pieces are merged here, lowest rank
+    # first, which gives the same result as long as the pre-tokenizer matches (it does with the regex module).
+    def __init__(self, vocab_path, pattern=None, memo_entries=DEFAULT_MEMO_ENTRIES):
+        super().__init__(memo_entries)
+        self.vocab_path = vocab_path
+        self.ranks = load_bpe_ranks(vocab_path)
+        self.name = f"bpe:{len(self.ranks)}"
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.Encoding(name=self.name, pat_str=pattern or BPE_PATTERN, mergeable_ranks=self.ranks, special_tokens={})
+            except Exception as e: # tiktoken validates the vocabulary and the pattern itself
+                logging.warning(f"tiktoken cannot use {vocab_path} ({e}), merging BPE pieces in Python")
+        self.pattern = regex.compile(pattern or BPE_PATTERN) if regex is not None else re.compile(pattern or BPE_PATTERN_RE)
+        self.piece_counts = {}
+    def _count(self, text):
+        if self.encoding is not None:
+            try:
+                return len(self.encoding.encode_ordinary(text))
+            except (UnicodeEncodeError, ValueError): # Lone surrogates
+                pass
+        piece_counts = self.piece_counts
+        total = 0
+        for piece in self.pattern.findall(text):
+            size = piece_counts.get(piece)
+            if size is None:
+                size = self._merge(piece.encode("utf-8", "surrogatepass"))
+                if len(piece_counts) >= self.memo_entries:
+                    piece_counts.clear()
+                piece_counts[piece] = size
+            total += size
+        return total
+    def _merge(self, piece):
+        # Number of tokens the byte string is encoded to: repeatedly merge the adjacent pair with the lowest rank
+        ranks = self.ranks
+        if piece in ranks:
+            return 1
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best = None
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best is None or rank < best[0]):
+                    best = (rank, i)
+            if best is None:
+                break
+            i = best[1]
+            parts[i:i + 2] = [parts[i] + parts[i + 1]]
+        return len(parts)
+    def signature(self):
+        return f"{self.name}({self.vocab_path})"
+class CallableEstimator(TokenEstimator):
+    # Wraps a plugin's function(text) -> number of tokens
+    def __init__(self, name, func, memo_entries=DEFAULT_MEMO_ENTRIES):
+        super().__init__(memo_entries)
+        self.name = name
+        self.func = func
+    def _count(self, text):
+        return int(self.func(text))
+def load_bpe_ranks(vocab_path):
+    # Reads a tiktoken vocabulary: {token bytes: rank}
+    ranks = {}
+    with open(vocab_path, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) != 2:
+                raise ValueError(f"{vocab_path}:{line_number}: expected '<base64 token> <rank>'")
+            ranks[base64.b64decode(fields[0])] = int(fields[1])
+    if not ranks:
+        raise ValueError(f"{vocab_path} holds no tokens")
+    return ranks
+# --- Factory Section ---
+def create_estimator(config, size_unit=None):
+    # size_unit (or the "SizeUnit" config key) picks characters or tokens. Tokens are counted by the estimator named in
+    # "TokenEstimator": "approx", "bpe" (the default when "TokenizerVocab" names a vocabulary file, with an optional
+    # "TokenizerPattern") or a "module:function" plugin. An estimator that cannot be set up falls back to "approx".
+    size_unit = size_unit or config.get("SizeUnit", "chars")
+    if size_unit not in SIZE_UNITS:
+        raise ValueError(f"Unknown size unit: {size_unit} (expected one of {', '.join(SIZE_UNITS)})")
+    if size_unit == "chars":
+        return CharacterCounter()
+    vocab_path = config.get("TokenizerVocab")
+    spec = config.get("TokenEstimator", "bpe" if vocab_path else "approx")
+    try:
+        if spec == "bpe":
+            if not vocab_path:
+                raise ValueError("TokenizerVocab is not set")
+            return BpeTokenEstimator(vocab_path, config.get("TokenizerPattern"))
+        if ":" in spec:
+            return CallableEstimator(spec, load_callable(spec))
+        if spec != "approx":
+            raise ValueError(f"unknown estimator {spec}")
+    except (OSError, ImportError, AttributeError, ValueError, re.error) as e:
+        logging.warning(f"Cannot set up token estimator {spec}: {e}, using the approximation")
+    return ApproxTokenEstimator()
+# TODO (Enhancement): Read Hugging Face tokenizer.json vocabularies as well as tiktoken files.